@@ -0,0 +1,18 @@
+"""
+Gunicorn hooks for the Render deploy (see render.yaml).
+
+With --preload the app is imported once in the master and workers are forked
+from it. Threads don't survive a fork, so the scraping loop is started in each
+worker after the fork rather than at import in the master.
+"""
+
+import os
+
+# Read by server.py at import; post_fork below starts the loop instead
+os.environ["SCRAPER_AUTOSTART"] = "0"
+
+
+def post_fork(arbiter, worker):
+    """Start the scraping loop in the freshly forked worker."""
+    import server
+    server.start_background_scraping()
@@ -3,16 +3,62 @@ Link scraper to extract pet links from Petfinder search page HTML.
 Extracts links from the search results by calling the scraping server.
 """
 
+import functools
 import os
+from typing import Optional
+
+import lxml.etree
+import lxml.html
+import orjson
 import requests
-from playwright.sync_api import sync_playwright
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 SCRAPING_KEY_FILE = "endpointkey.txt"
 SCRAPING_SERVER_URL = "https://petfinder-scraper.onrender.com/scrape-js"
 
+# Shared HTTP session so every fetch reuses pooled keep-alive connections to the
+# scraping server instead of paying a new TCP+TLS handshake per request.
+# Read timeouts are not retried here (read=0): a render that hit the 120 s timeout
+# is left to the caller's own retry loop instead of being repeated back to back
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, read=0, backoff_factor=0.3),
+))
+
+# Reusable HTML parser: skips comments and the id hash table (unused by the XPaths)
+HTML_PARSER = lxml.html.HTMLParser(remove_comments=True, collect_ids=False)
+
+# Anchor: the search results grid holding the pet cards
+RESULTS_XPATH = lxml.etree.XPath("/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]")
+
+# Hrefs of every pet card link in the results grid (relative to RESULTS_XPATH).
+# Cards sit either directly in the grid (div/div/...) or in a nested row
+# (div/div/div/...); one union query collects both in document order.
+CARD_LINKS_XPATH = lxml.etree.XPath(
+    "./div/div/div[1]/div/div[3]/div/a[contains(@href, '/details/')]/@href"
+    " | ./div/div/div/div[1]/div/div[3]/div/a[contains(@href, '/details/')]/@href"
+)
+
 
 def load_scraping_key() -> str:
-    """Load the scraping API key from endpointkey.txt."""
+    """
+    Load the scraping API key from endpointkey.txt.
+    The key is cached until the file's modification time changes, so a rotated
+    key is picked up on the next call without a restart (one stat per call).
+    """
+    try:
+        mtime = os.stat(SCRAPING_KEY_FILE).st_mtime_ns
+    except OSError:
+        mtime = None  # let the read report the error
+    return _read_scraping_key(mtime)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_scraping_key(mtime: Optional[int]) -> str:
+    """Read endpointkey.txt; cached per modification time by load_scraping_key()."""
     try:
         with open(SCRAPING_KEY_FILE, "r", encoding="utf-8") as f:
             key = f.read().strip()
@@ -25,6 +71,14 @@ def load_scraping_key() -> str:
         raise Exception(f"Error reading scraping key: {e}")
 
 
+def _server_error_message(response: requests.Response, default: str) -> str:
+    """Read the "error" field of a scraping server error response, falling back to the raw body."""
+    try:
+        return orjson.loads(response.content).get("error", default)
+    except Exception:
+        return response.text[:200] or default
+
+
 def fetch_html_from_server(url: str, key: str, wait_timeout: int = 20, additional_wait: int = 5) -> str:
     """
     Fetch HTML content from the scraping server using the JavaScript endpoint.
@@ -39,7 +93,7 @@ def fetch_html_from_server(url: str, key: str, wait_timeout: int = 20, additiona
         HTML content as string
     """
     try:
-        response = requests.get(
+        response = _SESSION.get(
             SCRAPING_SERVER_URL,
             params={
                 "url": url,
@@ -54,10 +108,10 @@ def fetch_html_from_server(url: str, key: str, wait_timeout: int = 20, additiona
             html_content = response.text
             return html_content
         elif response.status_code == 401:
-            error_msg = response.json().get("error", "Authentication failed")
+            error_msg = _server_error_message(response, "Authentication failed")
             raise Exception(f"Authentication failed: {error_msg}")
         else:
-            error_msg = response.json().get("error", f"HTTP {response.status_code}")
+            error_msg = _server_error_message(response, f"HTTP {response.status_code}")
             raise Exception(f"Scraping server error: {error_msg}")
     except requests.exceptions.RequestException as e:
         raise Exception(f"Error connecting to scraping server: {e}")
@@ -86,68 +140,30 @@ def extract_links_from_html(html_content: str = None, url: str = None) -> list:
         html_content = fetch_html_from_server(url, key)
         print(f"Successfully fetched HTML ({len(html_content)} characters)")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-        
-        try:
-            # Load the HTML content
-            page.set_content(html_content, wait_until="domcontentloaded")
-            page.wait_for_timeout(500)  # Small wait for any dynamic content
-            
-            # Extract links using the specific XPaths provided
-            xpaths = [
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[1]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[2]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[3]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[5]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[5]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[6]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[9]/div[2]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[9]/div[4]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[9]/div[5]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[10]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[11]/div/div[1]/div/div[3]/div/a",
-                "/html/body/div[2]/div/div/section/section/main/div/section/div/div[2]/div[12]/div/div[1]/div/div[3]/div/a",
-            ]
-            
-            for i, xpath in enumerate(xpaths, 1):
-                try:
-                    # Get the href attribute from the link
-                    href = page.evaluate("""
-                        (xpath) => {
-                            const result = document.evaluate(
-                                xpath,
-                                document,
-                                null,
-                                XPathResult.FIRST_ORDERED_NODE_TYPE,
-                                null
-                            );
-                            const element = result.singleNodeValue;
-                            if (element && element.tagName === 'A') {
-                                return element.href || element.getAttribute('href') || '';
-                            }
-                            return '';
-                        }
-                    """, xpath)
-                    
-                    if href:
-                        # Make sure it's a full URL
-                        if href.startswith('/'):
-                            href = f"https://www.petfinder.com{href}"
-                        links.append(href)
-                        print(f"Found link {i}: {href}")
-                    else:
-                        print(f"No link found at XPath {i}")
-                        
-                except Exception as e:
-                    print(f"Error extracting link {i}: {e}")
-            
-        finally:
-            page.close()
-            context.close()
-            browser.close()
+    # Parse the already-rendered HTML once (no browser needed)
+    tree = lxml.html.document_fromstring(html_content, parser=HTML_PARSER)
+    
+    # Resolve the results grid once; card links are looked up relative to it
+    result = RESULTS_XPATH(tree)
+    if not result:
+        print("No search results found on page")
+        return links
+    results_grid = result[0]
+    
+    # One traversal returns every card link; dedupe while preserving page order
+    hrefs = list(dict.fromkeys(str(href).strip() for href in CARD_LINKS_XPATH(results_grid)))
+    
+    for i, href in enumerate(hrefs, 1):
+        if not href:
+            continue
+        # Make sure it's a full URL
+        if href.startswith('/'):
+            href = f"https://www.petfinder.com{href}"
+        links.append(href)
+        print(f"Found link {i}: {href}")
+    
+    if not links:
+        print("No pet links found on page")
     
     return links
 
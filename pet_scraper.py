@@ -3,21 +3,30 @@ Petfinder scraper for individual pet pages.
 Scrapes pet information and stores it in a CSV file.
 
 Run (Linux-friendly):
-  pip install playwright
-  playwright install chromium
-  python pet_scraper.py
+  pip install -r requirements.txt
+  python pet_scraper.py <pet_url>
 """
 
+import atexit
 import csv
+import functools
+import hashlib
+import logging
+import logging.handlers
 import os
+import queue
 import re
 import sys
-import time
-from contextlib import suppress
-from typing import Dict, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
+import lxml.etree
+import lxml.html
+import orjson
 import requests
-from playwright.sync_api import sync_playwright
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # Data directory for persistent storage (mounted Render Disk)
@@ -40,9 +49,49 @@ LOG_PATH = os.path.join(DATA_DIR, "pet_scraper.log")
 SCRAPING_KEY_FILE = "endpointkey.txt"
 SCRAPING_SERVER_URL = "https://petfinder-scraper.onrender.com/scrape"
 
+# Keep-alive connections kept per host. Should be at least the number of threads
+# fetching at once (scrape/verify workers); beyond it connections are discarded
+# after each request instead of being reused
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 50))
+
+# Shared HTTP session so every fetch reuses pooled keep-alive connections to the
+# scraping server instead of paying a new TCP+TLS handshake per request
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=HTTP_POOL_SIZE,
+    # Rate limiting and gateway errors from the scraping server are retried here
+    # (with backoff) instead of surfacing as failures to every caller. Read
+    # timeouts are not (read=0): each retry would be another full render and
+    # hold the worker, and /stop, for another 60 s
+    max_retries=Retry(total=3, read=0, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+
+
+class ScrapingServerError(Exception):
+    """The scraping server answered with an error instead of the page HTML."""
+
+
+class ScrapingAuthError(ScrapingServerError):
+    """The scraping server rejected the API key."""
+
 
 def load_scraping_key() -> str:
-    """Load the scraping API key from endpointkey.txt."""
+    """
+    Load the scraping API key from endpointkey.txt.
+    The key is cached until the file's modification time changes, so a rotated
+    key is picked up on the next call without a restart (one stat per call).
+    """
+    try:
+        mtime = os.stat(SCRAPING_KEY_FILE).st_mtime_ns
+    except OSError:
+        mtime = None  # let the read report the error
+    return _read_scraping_key(mtime)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_scraping_key(mtime: Optional[int]) -> str:
+    """Read endpointkey.txt; cached per modification time by load_scraping_key()."""
     try:
         with open(SCRAPING_KEY_FILE, "r", encoding="utf-8") as f:
             key = f.read().strip()
@@ -57,103 +106,249 @@ def load_scraping_key() -> str:
         raise
 
 
-def fetch_html_from_server(url: str, key: str) -> str:
+def _server_error_message(response: requests.Response, default: str) -> str:
+    """Read the "error" field of a scraping server error response, falling back to the raw body."""
+    try:
+        return orjson.loads(response.content).get("error", default)
+    except Exception:
+        return response.text[:200] or default
+
+
+def fetch_html_from_server(url: str, key: str, raw: bool = False, session: Optional[requests.Session] = None):
     """
     Fetch HTML content from the scraping server.
     
     Args:
         url: The URL to scrape
         key: The API key for authentication
+        raw: If True, return the undecoded UTF-8 body so lxml can parse it
+            directly (skips requests' charset detection and the str copy)
+        session: Session to fetch with (default: the module's shared session)
         
     Returns:
-        HTML content as string
+        HTML content as string (bytes if raw)
     """
     try:
         log(f"Fetching HTML from scraping server for: {url}")
-        response = requests.get(
+        response = (session or _SESSION).get(
             SCRAPING_SERVER_URL,
             params={"url": url, "key": key},
             timeout=60
         )
         
         if response.status_code == 200:
+            if raw:
+                html_content = response.content
+                log(f"Successfully fetched HTML ({len(html_content)} bytes)")
+                return html_content
             html_content = response.text
             log(f"Successfully fetched HTML ({len(html_content)} characters)")
             return html_content
         elif response.status_code == 401:
-            error_msg = response.json().get("error", "Authentication failed")
+            error_msg = _server_error_message(response, "Authentication failed")
             log(f"Error: Authentication failed - {error_msg}")
-            raise Exception(f"Authentication failed: {error_msg}")
+            raise ScrapingAuthError(f"Authentication failed: {error_msg}")
         else:
-            error_msg = response.json().get("error", f"HTTP {response.status_code}")
+            error_msg = _server_error_message(response, f"HTTP {response.status_code}")
             log(f"Error from scraping server: {error_msg}")
-            raise Exception(f"Scraping server error: {error_msg}")
+            raise ScrapingServerError(f"Scraping server error: {error_msg}")
     except requests.exceptions.RequestException as e:
         log(f"Error connecting to scraping server: {e}")
         raise
 
 
-# XPaths for pet information
+# Anchor: the pet profile container every field lives under. Resolved once per page
+# so each field only walks its short relative path from here.
+PROFILE_XPATH = lxml.etree.XPath("/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section")
+
+# Sections of the profile (relative to PROFILE_XPATH). Each is resolved once per
+# page so the fields inside it only walk their few remaining steps.
+SECTION_XPATHS = {
+    "media": "./section[1]",
+    "details": "./section[3]",
+    "about": "./section[4]",
+}
+
+# XPaths for pet information, grouped by the section they are relative to
 XPATHS = {
-    "location": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[1]/div/div[1]/div/p",
-    "age": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[3]/div/div[1]/div/div[1]/div[1]/div",
-    "gender": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[3]/div/div[1]/div/div[1]/div[2]/span",
-    "size": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[3]/div/div[1]/div/div[1]/div[3]/div",
-    "color": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[3]/div/div[1]/div/div[2]/div/span",
-    "breed": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[2]/div[2]/div/div",
-    "spayed_neutered": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[4]/div/div/div[1]/div",
-    "vaccinated": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[4]/div/div/div[2]/div",
-    "special_needs": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[4]/div/div/div[3]/div",
-    "kids_compatible": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/section/ul/div[1]/div/p[3]",
-    "dogs_compatible": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/section/ul/div[2]/div/p[3]",
-    "cats_compatible": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/section/ul/div[3]/div/p[3]",
-    "about_me": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[4]/div",
-    "name": "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[3]/div[1]/div/div[1]/h2",
+    "details": {
+        "location": "./div[1]/div/div[1]/div/p",
+        "age": "./div[3]/div/div[1]/div/div[1]/div[1]/div",
+        "gender": "./div[3]/div/div[1]/div/div[1]/div[2]/span",
+        "size": "./div[3]/div/div[1]/div/div[1]/div[3]/div",
+        "color": "./div[3]/div/div[1]/div/div[2]/div/span",
+        "breed": "./div[2]/div[2]/div/div",
+        "spayed_neutered": "./div[4]/div/div/div[1]/div",
+        "vaccinated": "./div[4]/div/div/div[2]/div",
+        "special_needs": "./div[4]/div/div/div[3]/div",
+        "kids_compatible": "./section/ul/div[1]/div/p[3]",
+        "dogs_compatible": "./section/ul/div[2]/div/p[3]",
+        "cats_compatible": "./section/ul/div[3]/div/p[3]",
+        "name": "./div[1]/div/div[1]/h2",
+    },
+    "about": {
+        "about_me": "./div",
+    },
+    "media": {
+        "image": "./div/div[2]/div/div[1]/img",
+    },
+}
+
+# Per-thread HTML parsers: skip comments and the id hash table (nothing here looks
+# elements up by id). lxml serializes use of a parser, so threads get their own.
+# Raw bodies from the scraping server are UTF-8 (rendered page content).
+_PARSER_LOCAL = threading.local()
+
+
+def parse_html(html_content):
+    """Parse rendered HTML (str, or UTF-8 bytes) into an lxml document using this thread's reusable parser."""
+    attr = "bytes_parser" if isinstance(html_content, bytes) else "parser"
+    parser = getattr(_PARSER_LOCAL, attr, None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(
+            remove_comments=True,
+            collect_ids=False,
+            encoding="utf-8" if attr == "bytes_parser" else None,
+        )
+        setattr(_PARSER_LOCAL, attr, parser)
+    return lxml.html.document_fromstring(html_content, parser=parser)
+
+
+# XPaths compiled once at import and shared by every scraped pet
+COMPILED_SECTION_XPATHS = {section: lxml.etree.XPath(expr) for section, expr in SECTION_XPATHS.items()}
+COMPILED_XPATHS = {
+    section: {name: lxml.etree.XPath(expr) for name, expr in fields.items()}
+    for section, fields in XPATHS.items()
 }
 
+# Fields stored as cleaned text (image holds its src URL)
+TEXT_FIELDS = ("location", "age", "gender", "size", "color", "breed", "about_me", "image")
+
+# Fields parsed into True/False (None when not found on the page)
+BOOLEAN_FIELDS = (
+    "spayed_neutered", "vaccinated", "special_needs",
+    "kids_compatible", "dogs_compatible", "cats_compatible",
+)
+
+# Fields read from every pet page (excluding link and pet_type, which are always present)
+FIELDS = (
+    "name", "location", "age", "gender", "size", "color", "breed",
+    "spayed_neutered", "vaccinated", "special_needs",
+    "kids_compatible", "dogs_compatible", "cats_compatible",
+    "about_me", "image",
+)
+
+
+def _setup_logger() -> logging.Logger:
+    """
+    Create the scraper logger. Records go onto a queue and a background listener
+    thread writes them to the console and LOG_PATH, so callers never block on I/O.
+    """
+    formatter = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    console_handler = logging.StreamHandler(sys.stdout)
+    file_handler = logging.FileHandler(LOG_PATH, encoding="utf-8")
+    console_handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
+    
+    global _log_handlers, _queue_handler
+    _log_handlers = (console_handler, file_handler)
+    _queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    _start_log_listener()
+    # Drain queued records and close the log file on interpreter exit
+    atexit.register(_stop_log_listener)
+    # A forked child (gunicorn --preload workers) inherits the queue but not the
+    # listener thread; without a new listener its records would pile up unseen
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_start_log_listener)
+    
+    scraper_logger = logging.getLogger("pet_scraper")
+    scraper_logger.setLevel(logging.INFO)
+    scraper_logger.addHandler(_queue_handler)
+    scraper_logger.propagate = False
+    return scraper_logger
+
+
+_log_handlers = ()
+_queue_handler = None
+_log_listener = None
+
+
+def _start_log_listener() -> None:
+    """Start a listener thread for this process on a fresh queue (records the parent had not written yet stay with the parent)."""
+    global _log_listener
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _log_listener = logging.handlers.QueueListener(log_queue, *_log_handlers)
+    _log_listener.start()
+
+
+def _stop_log_listener() -> None:
+    """Write out queued records and stop this process's listener."""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+logger = _setup_logger()
+
 
 def log(msg: str) -> None:
     """Log message to console and log file."""
-    ts = time.strftime("%Y-%m-%d %H:%M:%S")
-    line = f"[{ts}] {msg}"
-    print(line, flush=True)
-    with open(LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
-        f.flush()
+    logger.info(msg)
 
 
 def clean_text(text: str) -> str:
     """Clean and normalize text."""
     if not text:
         return ""
-    text = text.strip()
     # Remove trailing asterisks often used as footnote markers
-    text = re.sub(r"\*+$", "", text).strip()
-    return text
+    return text.strip().rstrip("*").strip()
+
 
+# Tags whose content the browser renders on its own line (used to approximate innerText)
+BLOCK_TAGS = {"p", "div", "li", "section", "article", "h1", "h2", "h3", "h4", "h5", "h6"}
 
-def get_text(page, xpath: str, field_name: str = "") -> str:
-    """Get text from page element using XPath. Gets element[0].innerText."""
+
+def inner_text(element) -> str:
+    """
+    Approximate the browser's element.innerText for an lxml element.
+    Line breaks are kept for <br> and block-level elements so multi-paragraph
+    text (e.g. about_me) keeps its structure.
+    """
+    parts = []
+
+    def walk(el):
+        if not isinstance(el.tag, str):
+            # Comments / processing instructions carry no visible text
+            return
+        if el.tag == "br":
+            parts.append("\n")
+        elif el.tag in BLOCK_TAGS and parts:
+            parts.append("\n")
+        if el.text:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(element)
+    return "".join(parts)
+
+
+def first_element(tree, xpath: lxml.etree.XPath):
+    """Return the first element matching a compiled XPath (like $x(xpath)[0]), or None."""
+    result = xpath(tree)
+    return result[0] if result else None
+
+
+def get_text(tree, xpath: lxml.etree.XPath, field_name: str = "") -> str:
+    """Get text from parsed HTML tree using a compiled XPath. Gets element[0].innerText."""
     try:
-        # Use JavaScript evaluation to match browser console $x() behavior
-        # This ensures we get element[0].innerText exactly as in the browser
-        # Pass XPath as a parameter to avoid escaping issues
-        raw = page.evaluate("""
-            (xpath) => {
-                const result = document.evaluate(
-                    xpath,
-                    document,
-                    null,
-                    XPathResult.FIRST_ORDERED_NODE_TYPE,
-                    null
-                );
-                const element = result.singleNodeValue;
-                return element ? (element.innerText || '') : '';
-            }
-        """, xpath)
+        element = first_element(tree, xpath)
+        raw = inner_text(element) if element is not None else ""
         result = clean_text(raw)
         if not result and field_name:
-            log(f"Warning: Empty result for field '{field_name}' with XPath: {xpath[:50]}...")
+            log(f"Warning: Empty result for field '{field_name}' with XPath: {xpath.path[:50]}...")
         return result
     except Exception as e:
         if field_name:
@@ -161,81 +356,72 @@ def get_text(page, xpath: str, field_name: str = "") -> str:
         return ""
 
 
-def get_image_src(page, xpath: str, field_name: str = "") -> str:
-    """Get image src URL from img element using XPath. Gets element[0].src."""
+def get_image_src(tree, xpath: lxml.etree.XPath, field_name: str = "") -> str:
+    """Get image src URL from img element using a compiled XPath. Gets element[0].src."""
     try:
-        # Use JavaScript evaluation to get the src attribute of an img tag
-        src = page.evaluate("""
-            (xpath) => {
-                const result = document.evaluate(
-                    xpath,
-                    document,
-                    null,
-                    XPathResult.FIRST_ORDERED_NODE_TYPE,
-                    null
-                );
-                const element = result.singleNodeValue;
-                if (element && element.tagName === 'IMG') {
-                    return element.src || element.getAttribute('src') || '';
-                }
-                return '';
-            }
-        """, xpath)
-        return src.strip() if src else ""
+        element = first_element(tree, xpath)
+        if element is not None and element.tag == "img":
+            src = element.get("src") or ""
+            return src.strip()
+        return ""
     except Exception as e:
         if field_name:
             log(f"Warning: Error getting '{field_name}' image: {e}")
         return ""
 
 
-def click_show_more_if_exists(page, button_xpath: str) -> None:
-    """Check if show more button exists and click it if it does."""
-    with suppress(Exception):
-        # Check if button exists using JavaScript
-        button_exists = page.evaluate("""
-            (xpath) => {
-                const result = document.evaluate(
-                    xpath,
-                    document,
-                    null,
-                    XPathResult.FIRST_ORDERED_NODE_TYPE,
-                    null
-                );
-                const element = result.singleNodeValue;
-                return element !== null && element.offsetParent !== null;
-            }
-        """, button_xpath)
-        
-        if button_exists:
-            # Click the button using Playwright locator
-            try:
-                button_locator = page.locator(f"xpath={button_xpath}")
-                if button_locator.is_visible(timeout=3000):
-                    button_locator.click(timeout=5000)
-                    page.wait_for_timeout(500)  # Wait for content to expand
-                    del button_locator
-            except Exception:
-                pass  # Button might have disappeared or not be clickable
+def extract_fields(profile, max_failed: Optional[int] = None) -> Dict[str, str]:
+    """
+    Evaluate every field XPath in a single pass, resolving each profile
+    section once and reading its fields relative to it.
+    Returns the cleaned text per field; the image field holds the img src.
+    
+    Args:
+        profile: The pet profile element (or the whole document)
+        max_failed: If set, stop as soon as this many fields came back empty
+            (the result then only holds the fields read so far)
+    """
+    raw = {}
+    failed = 0
+    for section, fields in COMPILED_XPATHS.items():
+        section_node = first_element(profile, COMPILED_SECTION_XPATHS[section])
+        if section_node is None:
+            log(f"Warning: Profile section '{section}' not found")
+            raw.update((field_name, "") for field_name in fields)
+            failed += len(fields)
+        else:
+            for field_name, xpath in fields.items():
+                if field_name == "image":
+                    raw[field_name] = get_image_src(section_node, xpath, field_name)
+                else:
+                    raw[field_name] = get_text(section_node, xpath, field_name)
+                if max_failed is not None and field_failed(field_name, raw[field_name]):
+                    failed += 1
+                    if failed >= max_failed:
+                        return raw
+        if max_failed is not None and failed >= max_failed:
+            return raw
+    return raw
+
+
+# Boolean indicators, compiled once (negatives are checked first)
+NEGATIVE_RE = re.compile(r"\b(?:no|not|false|unchecked|n)\b|✗", re.IGNORECASE)
+POSITIVE_RE = re.compile(r"\b(?:yes|true|checked|check|y)\b|✓", re.IGNORECASE)
 
 
 def parse_boolean(text: str) -> bool:
     """Parse boolean from text. Returns True if text contains positive indicators."""
     if not text:
         return False
-    text_lower = text.lower().strip()
-    # Check for positive indicators
-    positive_indicators = ["yes", "true", "✓", "check", "checked", "y"]
-    negative_indicators = ["no", "false", "✗", "unchecked", "n"]
-    
-    for neg in negative_indicators:
-        if neg in text_lower:
-            return False
-    for pos in positive_indicators:
-        if pos in text_lower:
-            return True
+    text = text.strip()
+    
+    if NEGATIVE_RE.search(text):
+        return False
+    if POSITIVE_RE.search(text):
+        return True
     
     # Default: if text exists and doesn't explicitly say no, assume True
-    return bool(text_lower)
+    return bool(text)
 
 
 def extract_name_from_about(text: str) -> str:
@@ -249,12 +435,28 @@ def extract_name_from_about(text: str) -> str:
     return text
 
 
-def _scrape_pet_page(page, pet_link: str, scraping_key: str) -> Dict[str, str]:
+def field_failed(field_name: str, text: str) -> bool:
+    """Whether a raw field value from extract_fields counts as not read (same rule as the parsed pet data)."""
+    if field_name == "name":
+        return not extract_name_from_about(text)
+    return not text
+
+
+def find_profile(tree, pet_link: str):
+    """Return the pet profile element, falling back to the whole document if it is missing."""
+    profile = first_element(tree, PROFILE_XPATH)
+    if profile is None:
+        log(f"Warning: Pet profile section not found on {pet_link}")
+        return tree
+    return profile
+
+
+def parse_pet_html(html_content, pet_link: str) -> Dict[str, str]:
     """
-    Internal function to scrape information from a single pet page.
+    Extract pet information from the rendered HTML of a pet page.
     
     Args:
-        page: Playwright page object
+        html_content: HTML returned by the scraping server (str or UTF-8 bytes)
         pet_link: URL to the pet's page
         
     Returns:
@@ -279,57 +481,26 @@ def _scrape_pet_page(page, pet_link: str, scraping_key: str) -> Dict[str, str]:
         "image": "",
     }
     
-    # Fetch HTML from scraping server
-    html_content = fetch_html_from_server(pet_link, scraping_key)
-    
-    # Load the HTML into Playwright page
-    log(f"Loading HTML into page...")
-    page.set_content(html_content, wait_until="domcontentloaded")
-    page.wait_for_timeout(1000)  # Small wait for any dynamic content
-    
     log(f"Starting to scrape fields...")
     
     # Scrape all fields
     try:
-        # Image (get src from img tag)
-        image_xpath = "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[1]/div/div[2]/div/div[1]/img"
-        data["image"] = get_image_src(page, image_xpath, "image")
-        
-        data["location"] = get_text(page, XPATHS["location"], "location")
-        data["age"] = get_text(page, XPATHS["age"], "age")
-        data["gender"] = get_text(page, XPATHS["gender"], "gender")
-        data["size"] = get_text(page, XPATHS["size"], "size")
-        data["color"] = get_text(page, XPATHS["color"], "color")
-        data["breed"] = get_text(page, XPATHS["breed"], "breed")
-        
-        # Boolean fields - use None if text is empty (field not found), otherwise parse
-        spayed_text = get_text(page, XPATHS["spayed_neutered"], "spayed_neutered")
-        data["spayed_neutered"] = parse_boolean(spayed_text) if spayed_text else None
-        
-        vaccinated_text = get_text(page, XPATHS["vaccinated"], "vaccinated")
-        data["vaccinated"] = parse_boolean(vaccinated_text) if vaccinated_text else None
-        
-        special_needs_text = get_text(page, XPATHS["special_needs"], "special_needs")
-        data["special_needs"] = parse_boolean(special_needs_text) if special_needs_text else None
-        
-        kids_text = get_text(page, XPATHS["kids_compatible"], "kids_compatible")
-        data["kids_compatible"] = parse_boolean(kids_text) if kids_text else None
+        # Parse the already-rendered HTML once; every field is read off this tree
+        profile = find_profile(parse_html(html_content), pet_link)
         
-        dogs_text = get_text(page, XPATHS["dogs_compatible"], "dogs_compatible")
-        data["dogs_compatible"] = parse_boolean(dogs_text) if dogs_text else None
+        # Read every field off the profile in one pass, then post-process in Python
+        raw = extract_fields(profile)
         
-        cats_text = get_text(page, XPATHS["cats_compatible"], "cats_compatible")
-        data["cats_compatible"] = parse_boolean(cats_text) if cats_text else None
+        for field in TEXT_FIELDS:
+            data[field] = raw[field]
         
-        # About me (get everything in the div)
-        # Check for "Show more" button and click it if it exists
-        show_more_button_xpath = "/html/body/div[2]/div/div/section/section/main/main/div/div[1]/section/section[4]/div/button[2]"
-        click_show_more_if_exists(page, show_more_button_xpath)
-        data["about_me"] = get_text(page, XPATHS["about_me"], "about_me")
+        # Boolean fields - use None if text is empty (field not found), otherwise parse
+        for field in BOOLEAN_FIELDS:
+            text = raw[field]
+            data[field] = parse_boolean(text) if text else None
         
         # Name (extract from "About {name}" format)
-        name_text = get_text(page, XPATHS["name"], "name")
-        data["name"] = extract_name_from_about(name_text)
+        data["name"] = extract_name_from_about(raw["name"])
         
     except Exception as e:
         log(f"Warning: Error scraping fields from {pet_link}: {e}")
@@ -338,6 +509,70 @@ def _scrape_pet_page(page, pet_link: str, scraping_key: str) -> Dict[str, str]:
     return data
 
 
+def _scrape_pet_page(pet_link: str, scraping_key: str, session: Optional[requests.Session] = None) -> Dict[str, str]:
+    """
+    Internal function to scrape information from a single pet page.
+    
+    Args:
+        pet_link: URL to the pet's page
+        scraping_key: API key for the scraping server
+        session: Session to fetch with (default: the module's shared session)
+        
+    Returns:
+        Dictionary containing scraped pet information
+    """
+    # Fetch HTML from scraping server
+    html_content = fetch_html_from_server(pet_link, scraping_key, raw=True, session=session)
+    return parse_pet_html(html_content, pet_link)
+
+
+def scrape_pets_batch(
+    pet_links: List[str],
+    concurrency: int = 8,
+    limiter=None,
+    stop_event: Optional[threading.Event] = None,
+) -> List[Optional[Dict[str, str]]]:
+    """
+    Scrape several pet pages concurrently WITHOUT saving to CSV.
+    Each page is dominated by the scraping-server round trip, so a small thread
+    pool overlaps those waits over the shared keep-alive session.
+    
+    Args:
+        pet_links: URLs to the pets' pages
+        concurrency: Maximum number of pages fetched at once
+        limiter: Optional rate limiter (anything with acquire()) taken before each fetch
+        stop_event: Optional event; once set, links not yet fetched are skipped
+        
+    Returns:
+        List aligned with pet_links; None where a pet could not be fetched (or was skipped)
+    """
+    # Load scraping key once for the whole batch
+    try:
+        scraping_key = load_scraping_key()
+    except Exception as e:
+        log(f"Fatal error loading scraping key: {e}")
+        raise
+    
+    def stopped() -> bool:
+        return stop_event is not None and stop_event.is_set()
+    
+    def scrape_one(pet_link: str) -> Optional[Dict[str, str]]:
+        if stopped():
+            return None
+        if limiter is not None:
+            limiter.acquire()
+            if stopped():
+                return None
+        try:
+            return _scrape_pet_page(pet_link, scraping_key)
+        except Exception as e:
+            log(f"Error scraping pet {pet_link}: {e}")
+            return None
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(scrape_one, pet_links))
+
+
 def get_pet_csv_fields() -> list:
     """Return the ordered field names for pets.csv."""
     return [
@@ -376,19 +611,11 @@ def should_skip_pet(pet_data: Dict[str, str]) -> tuple[bool, str]:
     if name == "dog" or name == "cat":
         return True, f"Placeholder name detected: '{pet_data.get('name', '')}'"
     
-    # Fields to validate (excluding link and pet_type which are always present)
-    fields_to_check = [
-        "name", "location", "age", "gender", "size", "color", "breed",
-        "spayed_neutered", "vaccinated", "special_needs",
-        "kids_compatible", "dogs_compatible", "cats_compatible",
-        "about_me", "image"
-    ]
-    
     # Count null/empty fields
     null_count = 0
-    total_fields = len(fields_to_check)
+    total_fields = len(FIELDS)
     
-    for field in fields_to_check:
+    for field in FIELDS:
         value = pet_data.get(field)
         # Check if field is null, empty string, or False (for boolean fields, False is valid, but None/empty is not)
         if value is None:
@@ -407,85 +634,323 @@ def should_skip_pet(pet_data: Dict[str, str]) -> tuple[bool, str]:
     return False, ""
 
 
-def save_pet_to_csv(pet_data: Dict[str, str], csv_path: str = PET_CSV) -> None:
+# Every pet link starts with this; it carries no information, so it is not hashed
+_LINK_PREFIX = "https://www.petfinder.com/"
+_LINK_PREFIX_LEN = len(_LINK_PREFIX)
+
+
+def link_fingerprint(link: str) -> int:
+    """Return a 64-bit fingerprint of a link (collisions are negligible at crawl scale)."""
+    if link.startswith(_LINK_PREFIX):
+        link = link[_LINK_PREFIX_LEN:]
+    return int.from_bytes(hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class LinkSet:
+    """
+    Set of links held as 64-bit fingerprints instead of the link strings.
+    A ~100 character link string costs well over 100 bytes; a small int key
+    costs a fraction of that, which matters with hundreds of thousands of pets.
+    """
+    
+    def __init__(self, links=()):
+        self._keys = {link_fingerprint(link) for link in links}
+    
+    def __contains__(self, link: str) -> bool:
+        return link_fingerprint(link) in self._keys
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def add(self, link: str) -> None:
+        self._keys.add(link_fingerprint(link))
+    
+    def discard(self, link: str) -> None:
+        self._keys.discard(link_fingerprint(link))
+    
+    def update(self, links) -> None:
+        self._keys.update(link_fingerprint(link) for link in links)
+
+
+# Links stored in each pets CSV for callers that don't pass known_links to
+# save_pets_to_csv() (the server passes its links.idx set, so this stays empty
+# there). Scanned once per process; None marks a file whose header does not
+# match get_pet_csv_fields() and must be normalized by a full rewrite first.
+_LINK_INDEX: Dict[str, Optional[LinkSet]] = {}
+
+# Whether each CSV's header matches get_pet_csv_fields(), checked once per file
+_HEADER_MATCHES: Dict[str, bool] = {}
+
+# Updates to pets already in a CSV, keyed by path then link. They are held in
+# memory and written in one rewrite every CSV_FLUSH_EVERY updates (and at exit)
+# instead of rewriting the whole file for each updated pet.
+_PENDING_UPDATES: Dict[str, Dict[str, Dict]] = {}
+CSV_FLUSH_EVERY = 50
+
+# Buffer size for whole-file CSV reads and rewrites (rows carry long about_me
+# text, so the default 8KB buffer means many small syscalls)
+CSV_BUFFER_SIZE = 1 << 20
+
+# CSV files written since their last fsync; synced once at exit
+_UNSYNCED_PATHS: set = set()
+
+# Guards the link index, pending updates and the CSV files themselves
+_CSV_LOCK = threading.RLock()
+
+
+def _format_csv_value(val) -> str:
+    """Convert a scraped value to its CSV string (booleans as True/False, None as empty)."""
+    if isinstance(val, bool):
+        return "True" if val else "False"
+    return str(val) if val is not None else ""
+
+
+def _get_link_index(csv_path: str) -> Optional[LinkSet]:
+    """Return the set of links in csv_path, reading the file only on first use."""
+    if csv_path in _LINK_INDEX:
+        return _LINK_INDEX[csv_path]
+    
+    links = LinkSet()
+    if os.path.exists(csv_path):
+        try:
+            with open(csv_path, newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header and header != get_pet_csv_fields():
+                    links = None
+                elif header:
+                    link_idx = header.index("link")
+                    for r in reader:
+                        if len(r) > link_idx and r[link_idx].strip():
+                            links.add(r[link_idx].strip())
+        except Exception as e:
+            log(f"Error reading CSV file {csv_path}: {e}")
+            raise
+    
+    _LINK_INDEX[csv_path] = links
+    _HEADER_MATCHES[csv_path] = links is not None
+    return links
+
+
+def _header_matches(csv_path: str) -> bool:
+    """Check (once per file) that csv_path is missing, empty or has the current header."""
+    if csv_path not in _HEADER_MATCHES:
+        header = None
+        if os.path.exists(csv_path):
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f), None)
+        _HEADER_MATCHES[csv_path] = not header or header == get_pet_csv_fields()
+    return _HEADER_MATCHES[csv_path]
+
+
+def save_pet_to_csv(pet_data: Dict[str, str], csv_path: str = PET_CSV, durable: bool = False) -> None:
     """
     Save or update pet data in CSV file.
-    Uses link as the unique identifier.
+    Uses link as the unique identifier. New pets are appended to the file;
+    updates to an existing link are buffered and written by flush_pet_csv().
+    
+    Args:
+        pet_data: Dictionary containing pet information
+        csv_path: CSV file to save to
+        durable: If True, write any buffered updates and fsync before returning.
+            Otherwise the OS flushes in its own time and the file is synced at exit.
+    """
+    save_pets_to_csv([pet_data], csv_path, durable)
+
+
+def save_pets_to_csv(
+    pets: List[Dict[str, str]],
+    csv_path: str = PET_CSV,
+    durable: bool = False,
+    known_links=None,
+) -> List[str]:
+    """
+    Save or update several pets in the CSV file.
+    All new pets are appended with a single open and write; updates are
+    buffered exactly as in save_pet_to_csv().
+    
+    Args:
+        pets: Dictionaries containing pet information
+        csv_path: CSV file to save to
+        durable: If True, write any buffered updates and fsync before returning
+        known_links: Links already in csv_path (anything supporting `in`). Only
+            read here; the caller records the returned links itself. If None,
+            this module keeps its own index of the file's links.
+        
+    Returns:
+        Links of the pets whose rows were written to the file by this call
+        (buffered updates are not included unless a flush wrote them)
+    """
+    with _CSV_LOCK:
+        if known_links is None:
+            links = _get_link_index(csv_path)
+        else:
+            links = known_links if _header_matches(csv_path) else None
+        new_pets = {}
+        pending = _PENDING_UPDATES.setdefault(csv_path, {})
+        
+        for pet_data in pets:
+            # Replace actual newlines in about_me with literal \n string to keep it on one line
+            if "about_me" in pet_data and pet_data["about_me"]:
+                pet_data["about_me"] = pet_data["about_me"].replace("\n", "\\n").replace("\r", "\\n")
+            
+            pet_link = pet_data.get("link", "").strip()
+            if links is not None and pet_link not in links:
+                new_pets[pet_link] = {**new_pets.get(pet_link, {}), **pet_data}
+            else:
+                # Existing link (or a file needing normalization): queue for the next rewrite.
+                # The index may still hold links removed by another writer; the rewrite
+                # appends the row in that case, so a stale entry only costs a rewrite.
+                pending[pet_link] = {**pending.get(pet_link, {}), **pet_data}
+        
+        written = []
+        if new_pets:
+            _append_pets_to_csv(list(new_pets.values()), csv_path, durable)
+            if known_links is None:
+                links.update(new_pets)
+            written.extend(new_pets)
+        
+        if durable or (pending and links is None) or len(pending) >= CSV_FLUSH_EVERY:
+            flushed = list(pending)
+            flush_pet_csv(csv_path, durable=durable)
+            written.extend(flushed)
+        return written
+
+
+def flush_pet_csv(csv_path: Optional[str] = None, durable: bool = False) -> None:
     """
-    # Replace actual newlines in about_me with literal \n string to keep it on one line
-    if "about_me" in pet_data and pet_data["about_me"]:
-        pet_data["about_me"] = pet_data["about_me"].replace("\n", "\\n").replace("\r", "\\n")
+    Write buffered pet updates to disk.
+    
+    Args:
+        csv_path: CSV file to flush; every file with pending updates if None
+        durable: If True, also fsync the flushed files
+    """
+    with _CSV_LOCK:
+        paths = [csv_path] if csv_path is not None else list(_PENDING_UPDATES.keys() | _UNSYNCED_PATHS)
+        for path in paths:
+            updates = _PENDING_UPDATES.pop(path, None)
+            if updates:
+                _rewrite_pet_csv(updates, path, durable)
+            elif durable and path in _UNSYNCED_PATHS and os.path.exists(path):
+                with open(path, "a", encoding="utf-8") as f:
+                    os.fsync(f.fileno())
+                _UNSYNCED_PATHS.discard(path)
+
+
+def _flush_pet_csv_at_exit() -> None:
+    """Write buffered updates and fsync every CSV touched by this process."""
+    try:
+        flush_pet_csv(durable=True)
+    except Exception as e:
+        log(f"Error flushing CSV files at exit: {e}")
+
+
+atexit.register(_flush_pet_csv_at_exit)
+
+
+def _append_pets_to_csv(pets: List[Dict[str, str]], csv_path: str, durable: bool = False) -> None:
+    """Append new pet rows to the CSV file, writing the header if the file is new."""
+    ordered_fields = get_pet_csv_fields()
+    rows = [
+        [_format_csv_value(pet_data[col]) if col in pet_data else "" for col in ordered_fields]
+        for pet_data in pets
+    ]
+    write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
     
+    try:
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+            if write_header:
+                writer.writerow(ordered_fields)
+            writer.writerows(rows)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if not durable:
+            _UNSYNCED_PATHS.add(csv_path)
+        log(f"Appended {len(rows)} pet(s) to CSV: {csv_path}")
+    except Exception as e:
+        log(f"Error appending to CSV file {csv_path}: {e}")
+        raise
+
+
+def _rewrite_pet_csv(updates: Dict[str, Dict], csv_path: str, durable: bool = False) -> None:
+    """Rewrite the CSV file with each pet in updates upserted by link (atomic replace)."""
     ordered_fields = get_pet_csv_fields()
+    field_count = len(ordered_fields)
     
+    # Rows are kept as positional lists in ordered_fields order (no dict per row)
     rows = []
-    found = False
-    pet_link = pet_data.get("link", "").strip()
+    found = set()
     
     # Read all rows, preserving order
     if os.path.exists(csv_path):
         try:
-            with open(csv_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                existing_fieldnames = reader.fieldnames or []
+            with open(csv_path, newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
+                reader = csv.reader(f)
+                header = next(reader, None) or []
+                col_idx = {col: i for i, col in enumerate(header)}
+                # Where each output column lives in the existing rows (None if missing)
+                positions = [col_idx.get(col) for col in ordered_fields]
+                link_i = col_idx.get("link")
+                same_layout = header == ordered_fields
+                
                 for r in reader:
-                    if r.get("link", "").strip() == pet_link:
-                        # Update existing row
-                        found = True
-                        updated_row = {col: "" for col in ordered_fields}
-                        for col in ordered_fields:
-                            if col in pet_data:
-                                # Convert boolean to string
-                                val = pet_data[col]
-                                if isinstance(val, bool):
-                                    updated_row[col] = "True" if val else "False"
-                                else:
-                                    updated_row[col] = str(val) if val is not None else ""
-                            else:
-                                # Preserve existing value if not in new data
-                                updated_row[col] = r.get(col, "")
-                        rows.append(updated_row)
+                    if not r:
+                        continue
+                    existing = [r[i] if i is not None and i < len(r) else "" for i in positions]
+                    row_link = r[link_i].strip() if link_i is not None and link_i < len(r) else None
+                    pet_data = updates.get(row_link)
+                    if pet_data is not None:
+                        # Update existing row, preserving values not in the new data
+                        found.add(row_link)
+                        rows.append([
+                            _format_csv_value(pet_data[col]) if col in pet_data else existing[j]
+                            for j, col in enumerate(ordered_fields)
+                        ])
+                    elif same_layout and len(r) == field_count:
+                        # Already in the right layout; keep the parsed list as-is
+                        rows.append(r)
                     else:
                         # Preserve other rows, ensuring all fields are present
-                        normalized_row = {col: r.get(col, "") for col in ordered_fields}
-                        rows.append(normalized_row)
+                        rows.append(existing)
         except Exception as e:
             log(f"Error reading CSV file {csv_path}: {e}")
             raise
     
-    # If not found, append new row
-    if not found:
-        row = {col: "" for col in ordered_fields}
-        for col in ordered_fields:
-            if col in pet_data:
-                val = pet_data[col]
-                if isinstance(val, bool):
-                    row[col] = "True" if val else "False"
-                else:
-                    row[col] = str(val) if val is not None else ""
-        rows.append(row)
+    # Append any pets that were not found
+    for pet_link, pet_data in updates.items():
+        if pet_link not in found:
+            rows.append([_format_csv_value(pet_data[col]) if col in pet_data else "" for col in ordered_fields])
     
     # Write to temporary file first, then atomically replace
     tmp = csv_path + ".tmp"
     row_count = len(rows)
+    link_pos = ordered_fields.index("link")
+    # Only rebuild our own index if this path has one (not when the caller passes known_links)
+    links = LinkSet(r[link_pos].strip() for r in rows if r[link_pos].strip()) if csv_path in _LINK_INDEX else None
     try:
-        with open(tmp, "w", newline="", encoding="utf-8") as f:
+        with open(tmp, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
             # QUOTE_MINIMAL automatically quotes fields containing newlines, commas, or quotes
-            writer = csv.DictWriter(
-                f, 
-                fieldnames=ordered_fields,
-                quoting=csv.QUOTE_MINIMAL
-            )
-            writer.writeheader()
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(ordered_fields)
             writer.writerows(rows)
-            f.flush()
-            os.fsync(f.fileno())
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
         
         # Clear rows from memory before atomic replace
         del rows
         
         # Atomic replace
         os.replace(tmp, csv_path)
+        if durable:
+            _UNSYNCED_PATHS.discard(csv_path)
+        else:
+            _UNSYNCED_PATHS.add(csv_path)
+        if links is not None:
+            _LINK_INDEX[csv_path] = links
+        _HEADER_MATCHES[csv_path] = True
         log(f"Updated CSV: {csv_path} (wrote {row_count} rows)")
     except Exception as e:
         log(f"Error writing CSV file {csv_path}: {e}")
@@ -498,13 +963,25 @@ def save_pet_to_csv(pet_data: Dict[str, str], csv_path: str = PET_CSV) -> None:
         raise
 
 
-def scrape_pet_data_only(pet_link: str) -> Tuple[Dict[str, str], int]:
+# A pet page with this many unreadable fields is treated as invalid (removed listing)
+VERIFY_FAIL_THRESHOLD = 3
+
+
+def scrape_pet_data_only(
+    pet_link: str,
+    verify_mode: bool = False,
+    session: Optional[requests.Session] = None,
+) -> Tuple[Dict[str, str], int]:
     """
     Scrape information from a single pet page WITHOUT saving to CSV.
     This is for verification purposes.
     
     Args:
         pet_link: URL to the pet's page
+        verify_mode: Only decide validity: stop reading fields once
+            VERIFY_FAIL_THRESHOLD of them failed, and return the raw field text
+            read so far instead of the parsed pet data
+        session: Session to fetch with (default: the module's shared session)
         
     Returns:
         Tuple of (dictionary containing scraped pet information, count of failed fields)
@@ -516,72 +993,43 @@ def scrape_pet_data_only(pet_link: str) -> Tuple[Dict[str, str], int]:
         log(f"Fatal error loading scraping key: {e}")
         raise
     
-    # Use Playwright just to parse the HTML (we don't need to navigate)
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.launch(
-                headless=True,  # Headless is fine since we're just parsing HTML
-                args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-dev-shm-usage",
-                ]
-            )
-        except Exception as e:
-            log(f"Fatal error launching browser: {e}")
-            raise
-        
+    if verify_mode:
+        html_content = fetch_html_from_server(pet_link, scraping_key, raw=True, session=session)
         try:
-            context = browser.new_context()
-            page = context.new_page()
+            profile = find_profile(parse_html(html_content), pet_link)
+            raw = extract_fields(profile, max_failed=VERIFY_FAIL_THRESHOLD)
         except Exception as e:
-            log(f"Fatal error creating context/page: {e}")
-            try:
-                browser.close()
-            except Exception:
-                pass
-            raise
-        
-        try:
-            # Scrape the pet data using the scraping server (no CSV save)
-            data = _scrape_pet_page(page, pet_link, scraping_key)
-            
-            # Count failed fields
-            expected_fields = [
-                "name", "location", "age", "gender", "size", "color", "breed",
-                "spayed_neutered", "vaccinated", "special_needs",
-                "kids_compatible", "dogs_compatible", "cats_compatible",
-                "about_me", "image"
-            ]
-            
-            failed_count = 0
-            for field in expected_fields:
-                value = data.get(field)
-                # Check if field failed to be read
-                if isinstance(value, bool):
-                    # Boolean field was read successfully (True or False means field was found)
-                    pass
-                elif value is None or value == "":
-                    # Field failed to be read (None or empty string)
-                    failed_count += 1
-            
-            return data, failed_count
-        finally:
-            try:
-                page.close()
-            except Exception:
-                pass
-            try:
-                context.close()
-            except Exception:
-                pass
-            try:
-                browser.close()
-            except Exception:
-                pass
-
-
-def scrape_pet(pet_link: str, pet_type: str = "") -> Dict[str, str]:
+            # Unparseable page: nothing could be read
+            log(f"Warning: Error scraping fields from {pet_link}: {e}")
+            return {}, VERIFY_FAIL_THRESHOLD
+        return raw, sum(field_failed(field_name, text) for field_name, text in raw.items())
+    
+    # Scrape the pet data using the scraping server (no CSV save)
+    data = _scrape_pet_page(pet_link, scraping_key, session=session)
+    
+    # Count failed fields
+    failed_count = 0
+    for field in FIELDS:
+        value = data.get(field)
+        # Check if field failed to be read
+        if isinstance(value, bool):
+            # Boolean field was read successfully (True or False means field was found)
+            pass
+        elif value is None or value == "":
+            # Field failed to be read (None or empty string)
+            failed_count += 1
+    
+    return data, failed_count
+
+
+def is_pet_saved(pet_link: str, csv_path: str = PET_CSV) -> bool:
+    """Check whether a link is already in the CSV (uses the in-memory link index, no file read after the first)."""
+    with _CSV_LOCK:
+        links = _get_link_index(csv_path)
+        return links is not None and pet_link.strip() in links
+
+
+def scrape_pet(pet_link: str, pet_type: str = "", skip_saved: bool = True) -> Optional[Dict[str, str]]:
     """
     Scrape information from a single pet page.
     This is the main function to be called externally.
@@ -589,10 +1037,16 @@ def scrape_pet(pet_link: str, pet_type: str = "") -> Dict[str, str]:
     Args:
         pet_link: URL to the pet's page
         pet_type: Type of pet ("dog" or "cat") - will be added to CSV
+        skip_saved: If True, a pet already in the CSV is not fetched again.
+            Pass False to re-scrape it and update its row.
         
     Returns:
-        Dictionary containing scraped pet information
+        Dictionary containing scraped pet information, or None if already saved
     """
+    if skip_saved and is_pet_saved(pet_link):
+        log(f"Skipping already saved pet: {pet_link}")
+        return None
+    
     # Load scraping key
     try:
         scraping_key = load_scraping_key()
@@ -600,62 +1054,22 @@ def scrape_pet(pet_link: str, pet_type: str = "") -> Dict[str, str]:
         log(f"Fatal error loading scraping key: {e}")
         raise
     
-    # Use Playwright just to parse the HTML (we don't need to navigate)
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.launch(
-                headless=True,  # Headless is fine since we're just parsing HTML
-                args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-dev-shm-usage",
-                ]
-            )
-        except Exception as e:
-            log(f"Fatal error launching browser: {e}")
-            raise
-        
-        try:
-            context = browser.new_context()
-            page = context.new_page()
-        except Exception as e:
-            log(f"Fatal error creating context/page: {e}")
-            try:
-                browser.close()
-            except Exception:
-                pass
-            raise
-        
-        try:
-            # Scrape the pet data using the scraping server
-            data = _scrape_pet_page(page, pet_link, scraping_key)
-            
-            # Add pet_type to data
-            data["pet_type"] = pet_type
-            
-            # Validate pet data before saving
-            should_skip, reason = should_skip_pet(data)
-            if should_skip:
-                log(f"Skipping pet {pet_link}: {reason}")
-                return data
-            
-            # Save to CSV (will check for duplicates by link)
-            save_pet_to_csv(data)
-            
-            return data
-        finally:
-            try:
-                page.close()
-            except Exception:
-                pass
-            try:
-                context.close()
-            except Exception:
-                pass
-            try:
-                browser.close()
-            except Exception:
-                pass
+    # Scrape the pet data using the scraping server
+    data = _scrape_pet_page(pet_link, scraping_key)
+    
+    # Add pet_type to data
+    data["pet_type"] = pet_type
+    
+    # Validate pet data before saving
+    should_skip, reason = should_skip_pet(data)
+    if should_skip:
+        log(f"Skipping pet {pet_link}: {reason}")
+        return data
+    
+    # Save to CSV (will check for duplicates by link)
+    save_pet_to_csv(data)
+    
+    return data
 
 
 if __name__ == "__main__":
@@ -665,7 +1079,8 @@ if __name__ == "__main__":
         log(f"Scraping pet: {pet_url}")
         try:
             result = scrape_pet(pet_url)
-            log(f"Successfully scraped: {result.get('name', 'Unknown')}")
+            if result is not None:
+                log(f"Successfully scraped: {result.get('name', 'Unknown')}")
         except Exception as e:
             log(f"Error scraping pet: {e}")
     else:
@@ -0,0 +1,35 @@
+"""
+Token-bucket rate limiter shared by the scraping server and link verification.
+"""
+
+import threading
+import time
+from typing import Dict, List
+
+
+class RateLimiter:
+    """
+    Token bucket shared across threads: allows `rate` acquisitions per second on
+    average, with bursts of up to `burst`. Each key (e.g. a host name) gets its
+    own bucket; callers that don't pass a key share a single one.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._buckets: Dict[str, List[float]] = {}  # key -> [tokens, last refill time]
+        self._lock = threading.Lock()
+    
+    def acquire(self, key: str = "") -> None:
+        """Block until a token for key is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                bucket = self._buckets.setdefault(key, [float(self.capacity), now])
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return
+                wait = (1 - bucket[0]) / self.rate
+            time.sleep(wait)
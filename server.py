@@ -3,22 +3,43 @@ Petfinder Scraper Server
 Continuously scrapes Petfinder search pages and maintains a database of pets.
 """
 
+import atexit
 import csv
-import json
+import hmac
 import os
+import random
+import signal
+import struct
 import sys
 import time
-import subprocess
-from threading import Thread
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Event, Lock, Thread
+from typing import Optional
 
+import orjson
 from flask import Flask, jsonify
 
 from link_scraper import extract_links_from_html, load_scraping_key
-from pet_scraper import scrape_pet, get_pet_csv_fields, PET_CSV, log
+from pet_scraper import scrape_pets_batch, save_pets_to_csv, should_skip_pet, get_pet_csv_fields, flush_pet_csv, LinkSet, CSV_BUFFER_SIZE, PET_CSV, log
+from rate_limiter import RateLimiter
 from verify import verify_link
-from flask import request, Response
+from flask import request, Response, send_file, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() responses skip the stdlib encoder."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Data directory for persistent storage (mounted Render Disk)
 # Use /data on Render (Linux), or local "data" directory for development (Windows)
@@ -38,6 +59,78 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # Progress file to persist scraping state
 PROGRESS_FILE = os.path.join(DATA_DIR, "scraping_progress.json")
 
+# Progress is written at most this often (seconds); the latest state is kept in
+# memory in between and flushed at exit / SIGTERM
+PROGRESS_FLUSH_INTERVAL = 5
+_pending_progress = None
+_last_progress_flush = 0.0
+_progress_lock = Lock()
+
+# Last saved progress (flushed or not), so a restarted loop resumes from memory;
+# None until loaded from disk, {} after a reset
+_progress_state = None
+
+# The progress file is one fixed-size record rewritten in place through a
+# descriptor kept open: <crc32><length> header, JSON payload, zero padding.
+# No truncate/rename per save; the CRC rejects a torn write.
+PROGRESS_RECORD_SIZE = 512
+_PROGRESS_HEADER = struct.Struct("<II")
+_progress_fd = None
+
+# Append-only index of links saved to pets.csv (one per line), so duplicate
+# checks never have to re-parse the CSV
+LINKS_INDEX_FILE = os.path.join(DATA_DIR, "links.idx")
+
+# Held (flock) by the one process that runs the scraping loop, so multiple
+# gunicorn workers don't each scrape and each load the link set
+SCRAPER_LOCK_FILE = os.path.join(DATA_DIR, "scraper.lock")
+_scraper_lock_fd = None
+# Process that took the lock; a forked child inherits the fd but not the loop
+_scraper_lock_pid = None
+
+# The scraping loop thread of this process; _start_lock makes check-and-start atomic
+scraping_thread = None
+_start_lock = Lock()
+
+
+# In-memory copy of the links index and how far into the file it has been read
+_existing_links = None
+_links_offset = 0
+_links_lock = Lock()
+
+# links.idx append handle, opened once and reused for every page's links
+_links_append_file = None
+
+# Links verified during the current verification pass (JSON lines of
+# {"link", "valid"}), so an interrupted pass resumes without re-checking them
+VERIFIED_LOG_FILE = os.path.join(DATA_DIR, "verified.log")
+
+# Links found invalid by verification (one per line). Their rows stay in
+# pets.csv until compact_csv() drops them in a single pass.
+REMOVED_LINKS_FILE = os.path.join(DATA_DIR, "removed.set")
+
+# Verification concurrency and the overall request rate shared by all workers.
+# The default rate keeps the old one-check-per-0.5s courtesy throttle (like
+# SCRAPE_RATE); the workers only overlap the slow renders. Raise both via env.
+VERIFY_WORKERS = int(os.environ.get("VERIFY_WORKERS", 4))
+VERIFY_RATE = float(os.environ.get("VERIFY_RATE", 2))
+VERIFY_BATCH_SIZE = 256
+
+# Rows serialized per chunk of the streamed /pets response
+PETS_STREAM_BATCH = 500
+
+# Pet pages scraped at once per search page, and the sustained rate (pets/sec)
+SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", 8))
+SCRAPE_RATE = float(os.environ.get("SCRAPE_RATE", 1))
+
+# Search page fetches are retried with exponential backoff plus jitter
+# (~1s, ~2s, ... capped), so transient scraping server failures don't lose a page
+LINK_FETCH_ATTEMPTS = 4
+LINK_FETCH_MAX_DELAY = 30
+
+# Search results page for a pet type ("dog"/"cat") and page number
+SEARCH_URL = "https://www.petfinder.com/search/{pet_type}s-for-adoption/us/ny/newyork/?distance=anywhere&page={page}"
+
 # Server status
 server_status = {
     "running": False,
@@ -48,44 +141,109 @@ server_status = {
     "total_pets_removed": 0,
 }
 
+# Set by /stop; checked by scrape workers and used for the loop's waits so a
+# stop takes effect without waiting out a page or a retry delay
+_stop_event = Event()
 
-def ensure_playwright_installed():
-    """Ensure Playwright Chromium is installed at runtime."""
-    try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            # Try to launch chromium - if it fails, install it
-            try:
-                browser = p.chromium.launch(headless=True)
-                browser.close()
-                log("Playwright Chromium is already installed")
-            except Exception:
-                log("Playwright Chromium not found, installing...")
-                subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], 
-                             check=False, capture_output=True)
-                log("Playwright Chromium installation attempted")
-    except Exception as e:
-        log(f"Error checking/installing Playwright: {e}")
 
+def _close_links_appender() -> None:
+    """Close the links.idx append handle (before the file is replaced). Caller holds _links_lock."""
+    global _links_append_file
+    if _links_append_file is not None:
+        _links_append_file.close()
+        _links_append_file = None
 
-# Ensure Playwright is installed when server starts
-ensure_playwright_installed()
+
+def rebuild_links_index(links) -> None:
+    """
+    Replace links.idx with the given links and reset the in-memory set.
+    
+    Args:
+        links: Every link currently stored in pets.csv
+    """
+    global _existing_links, _links_offset
+    with _links_lock:
+        # Stream links straight to the file and the new set (no intermediate list)
+        link_set = LinkSet()
+        tmp = LINKS_INDEX_FILE + ".tmp"
+        with open(tmp, "wb", buffering=CSV_BUFFER_SIZE) as f:
+            for link in links:
+                if link:
+                    f.write(f"{link}\n".encode("utf-8"))
+                    link_set.add(link)
+            size = f.tell()
+        _close_links_appender()
+        os.replace(tmp, LINKS_INDEX_FILE)
+        _existing_links = link_set
+        _links_offset = size
 
 
-def get_existing_links() -> set:
-    """Get all existing links from pets.csv to check for duplicates."""
-    existing_links = set()
-    if os.path.exists(PET_CSV):
+def get_existing_links() -> LinkSet:
+    """
+    Get all existing links to check for duplicates.
+    The links index is read fully once per process; later calls only read
+    lines appended since the last call.
+    """
+    global _existing_links, _links_offset
+    if _existing_links is None and not os.path.exists(LINKS_INDEX_FILE):
+        log("Building links index from pets.csv...")
         try:
-            with open(PET_CSV, "r", encoding="utf-8", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    link = row.get("link", "").strip()
-                    if link:
-                        existing_links.add(link)
+            rebuild_links_index(_iter_csv_links() if os.path.exists(PET_CSV) else ())
         except Exception as e:
             log(f"Error reading existing links: {e}")
-    return existing_links
+    
+    with _links_lock:
+        if _existing_links is None:
+            _existing_links = LinkSet()
+            _links_offset = 0
+        try:
+            # Nothing appended since the last read: skip opening the file
+            if os.stat(LINKS_INDEX_FILE).st_size == _links_offset:
+                return _existing_links
+            with open(LINKS_INDEX_FILE, "rb") as f:
+                f.seek(_links_offset)
+                tail = f.read()
+        except FileNotFoundError:
+            tail = b""
+        except Exception as e:
+            log(f"Error reading links index: {e}")
+            tail = b""
+        
+        # Only consume complete lines; a partial last line is picked up next time
+        end = tail.rfind(b"\n") + 1
+        if end:
+            _existing_links.update(
+                line.decode("utf-8") for line in tail[:end].split(b"\n") if line
+            )
+            _links_offset += end
+        return _existing_links
+
+
+def record_links(links) -> None:
+    """Append newly saved links to links.idx (one write) and the in-memory set."""
+    global _links_append_file, _links_offset
+    get_existing_links()
+    with _links_lock:
+        new_links = [link for link in dict.fromkeys(links) if link not in _existing_links]
+        if not new_links:
+            return
+        if _links_append_file is None:
+            _links_append_file = open(LINKS_INDEX_FILE, "ab")
+        data = "".join(f"{link}\n" for link in new_links).encode("utf-8")
+        start = _links_append_file.seek(0, os.SEEK_END)
+        _links_append_file.write(data)
+        _links_append_file.flush()
+        # Our own lines are already in the set; don't read them back
+        if start == _links_offset:
+            _links_offset = start + len(data)
+        _existing_links.update(new_links)
+
+
+def forget_link(link: str) -> None:
+    """Drop a link from the in-memory set (links.idx is rebuilt at the next compaction)."""
+    with _links_lock:
+        if _existing_links is not None:
+            _existing_links.discard(link)
 
 
 def check_link_exists(link: str) -> bool:
@@ -93,15 +251,51 @@ def check_link_exists(link: str) -> bool:
     return link in get_existing_links()
 
 
-def save_progress(page: int = None, pet_type: str = None, mode: str = "scraping", verification_link: str = None) -> None:
+# Shared by every page so politeness holds across pages, not just within one
+_scrape_limiter = RateLimiter(SCRAPE_RATE, burst=SCRAPE_WORKERS)
+
+
+def fetch_page_links(url: str) -> list:
+    """
+    Extract pet links from a search page, retrying failed fetches.
+    
+    Args:
+        url: Search page URL
+        
+    Returns:
+        List of pet URLs (raises the last error once all attempts fail)
+    """
+    for attempt in range(LINK_FETCH_ATTEMPTS):
+        try:
+            return extract_links_from_html(url=url)
+        except Exception as e:
+            if attempt == LINK_FETCH_ATTEMPTS - 1:
+                raise
+            # Jitter keeps concurrent retries from firing in lockstep
+            delay = min(LINK_FETCH_MAX_DELAY, 2 ** attempt) * (0.5 + random.random())
+            log(f"Error fetching links from {url} (attempt {attempt + 1}/{LINK_FETCH_ATTEMPTS}): {e}; retrying in {delay:.1f}s")
+            if _stop_event.wait(delay):
+                raise
+
+
+def save_progress(
+    page: int = None,
+    pet_type: str = None,
+    mode: str = "scraping",
+    verification_link: str = None,
+    force: bool = False,
+) -> None:
     """
-    Save scraping/verification progress to disk.
+    Save scraping/verification progress.
+    The latest progress is written to disk at most every PROGRESS_FLUSH_INTERVAL
+    seconds; anything newer is written by flush_progress() at shutdown.
     
     Args:
         page: Current page number (for scraping mode)
         pet_type: Current pet type ("dog" or "cat", for scraping mode)
         mode: Current mode ("scraping" or "verification")
         verification_link: Current link being verified (for verification mode)
+        force: Write to disk now instead of waiting for the flush interval
     """
     try:
         progress = {
@@ -115,15 +309,102 @@ def save_progress(page: int = None, pet_type: str = None, mode: str = "scraping"
         elif mode == "verification":
             progress["verification_link"] = verification_link
         
-        with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-            json.dump(progress, f)
+        global _pending_progress, _progress_state
+        with _progress_lock:
+            _pending_progress = progress
+            _progress_state = progress
+            due = force or time.time() - _last_progress_flush >= PROGRESS_FLUSH_INTERVAL
+        if due:
+            flush_progress()
     except Exception as e:
         log(f"Error saving progress: {e}")
 
 
+def _write_progress_record(progress) -> None:
+    """Overwrite the progress record in place (None writes an empty record). Caller holds _progress_lock."""
+    global _progress_fd
+    payload = orjson.dumps(progress) if progress is not None else b""
+    if _PROGRESS_HEADER.size + len(payload) > PROGRESS_RECORD_SIZE:
+        raise ValueError(f"Progress record too large ({len(payload)} bytes)")
+    record = _PROGRESS_HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+    
+    if _progress_fd is None:
+        _progress_fd = os.open(PROGRESS_FILE, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        os.ftruncate(_progress_fd, PROGRESS_RECORD_SIZE)
+    # lseek + write rather than pwrite, which Windows lacks
+    os.lseek(_progress_fd, 0, os.SEEK_SET)
+    os.write(_progress_fd, record.ljust(PROGRESS_RECORD_SIZE, b"\0"))
+
+
+def _parse_progress_record(raw: bytes):
+    """Decode a progress record; returns None if empty or corrupt. Accepts the older plain-JSON file."""
+    # CRC first: the header's first byte is the CRC's low byte, so a valid
+    # record can itself start with "{"
+    if len(raw) >= _PROGRESS_HEADER.size:
+        crc, length = _PROGRESS_HEADER.unpack_from(raw)
+        payload = raw[_PROGRESS_HEADER.size:_PROGRESS_HEADER.size + length]
+        if len(payload) == length and zlib.crc32(payload) == crc:
+            return orjson.loads(payload) if length else None
+    
+    # Not a valid record: the older plain-JSON file, or a torn write
+    if raw.startswith(b"{"):
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            return None
+    return None
+
+
+def flush_progress() -> None:
+    """Write the latest pending progress to disk, if any."""
+    global _pending_progress, _last_progress_flush
+    with _progress_lock:
+        progress = _pending_progress
+        _pending_progress = None
+        _last_progress_flush = time.time()
+        if progress is None:
+            return
+        try:
+            _write_progress_record(progress)
+        except Exception as e:
+            log(f"Error saving progress: {e}")
+
+
+atexit.register(flush_progress)
+
+
+def _flush_progress_on_sigterm(signum, frame):
+    """Flush progress before handing SIGTERM to the previous handler."""
+    flush_progress()
+    if callable(_previous_sigterm_handler):
+        _previous_sigterm_handler(signum, frame)
+    else:
+        sys.exit(0)
+
+
+# Only the main thread can install signal handlers (e.g. not when imported by a worker thread)
+try:
+    _previous_sigterm_handler = signal.signal(signal.SIGTERM, _flush_progress_on_sigterm)
+except ValueError:
+    _previous_sigterm_handler = None
+
+
+def _read_progress() -> dict:
+    """Return the current progress, reading the progress file only the first time."""
+    global _progress_state
+    with _progress_lock:
+        if _progress_state is None:
+            progress = None
+            if os.path.exists(PROGRESS_FILE):
+                with open(PROGRESS_FILE, "rb") as f:
+                    progress = _parse_progress_record(f.read())
+            _progress_state = progress or {}
+        return _progress_state
+
+
 def load_progress() -> tuple[str, int, str, str]:
     """
-    Load scraping/verification progress from disk.
+    Load scraping/verification progress (from disk on first use, then from memory).
     
     Returns:
         Tuple of (mode, page, pet_type, verification_link).
@@ -133,29 +414,27 @@ def load_progress() -> tuple[str, int, str, str]:
         - verification_link: Current link being verified (for verification mode)
         Returns ("scraping", 1, "dog", None) if no progress file exists.
     """
-    if not os.path.exists(PROGRESS_FILE):
-        return "scraping", 1, "dog", None
-    
     try:
-        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-            progress = json.load(f)
-            mode = progress.get("mode", "scraping")
-            
-            if mode == "verification":
-                verification_link = progress.get("verification_link", None)
-                log(f"Loaded progress: mode=verification, last_link={verification_link}")
-                return "verification", None, None, verification_link
-            else:
-                # Scraping mode
-                page = progress.get("page", 1)
-                pet_type = progress.get("pet_type", "dog")
-                # Ensure valid values
-                if page < 1 or page > 10000:
-                    page = 1
-                if pet_type not in ["dog", "cat"]:
-                    pet_type = "dog"
-                log(f"Loaded progress: mode=scraping, page={page}, pet_type={pet_type}")
-                return "scraping", page, pet_type, None
+        progress = _read_progress()
+        if not progress:
+            return "scraping", 1, "dog", None
+        mode = progress.get("mode", "scraping")
+        
+        if mode == "verification":
+            verification_link = progress.get("verification_link", None)
+            log(f"Loaded progress: mode=verification, last_link={verification_link}")
+            return "verification", None, None, verification_link
+        else:
+            # Scraping mode
+            page = progress.get("page", 1)
+            pet_type = progress.get("pet_type", "dog")
+            # Ensure valid values
+            if page < 1 or page > 10000:
+                page = 1
+            if pet_type not in ["dog", "cat"]:
+                pet_type = "dog"
+            log(f"Loaded progress: mode=scraping, page={page}, pet_type={pet_type}")
+            return "scraping", page, pet_type, None
     except Exception as e:
         log(f"Error loading progress: {e}")
         return "scraping", 1, "dog", None
@@ -163,9 +442,14 @@ def load_progress() -> tuple[str, int, str, str]:
 
 def reset_progress() -> None:
     """Reset progress file (called after reaching page 10000 and verification)."""
+    global _pending_progress, _progress_state
     try:
-        if os.path.exists(PROGRESS_FILE):
-            os.remove(PROGRESS_FILE)
+        with _progress_lock:
+            _pending_progress = None
+            _progress_state = {}
+            # Empty record rather than deleting the file (its descriptor stays open)
+            if _progress_fd is not None or os.path.exists(PROGRESS_FILE):
+                _write_progress_record(None)
         log("Progress reset to page 1")
     except Exception as e:
         log(f"Error resetting progress: {e}")
@@ -182,38 +466,55 @@ def scrape_pets_from_page(page: int, pet_type: str) -> int:
     Returns:
         Number of new pets scraped (excluding duplicates)
     """
-    url = f"https://www.petfinder.com/search/{pet_type}s-for-adoption/us/ny/newyork/?distance=anywhere&page={page}"
+    url = SEARCH_URL.format(pet_type=pet_type, page=page)
     log(f"Scraping page {page} for {pet_type}s: {url}")
     
     try:
         # Get links from search page
-        links = extract_links_from_html(url=url)
+        links = fetch_page_links(url)
         log(f"Found {len(links)} links on page {page} for {pet_type}s")
         
-        # Get existing links to avoid duplicates
+        # Get existing links to avoid duplicates (check before scraping to save time)
         existing_links = get_existing_links()
+        to_scrape = [link for link in links if link not in existing_links]
+        if len(to_scrape) < len(links):
+            log(f"Page {page} {pet_type}s: skipping {len(links) - len(to_scrape)} duplicate link(s)")
+        
+        # Rate limiter replaces the fixed per-pet sleep and is shared by all workers;
+        # after /stop, links not yet fetched are dropped. They are picked up on resume
+        # because resume always starts by redoing the saved page/pet_type, not because
+        # this page's progress goes unsaved (the loop saves it right after we return)
+        scraped = scrape_pets_batch(
+            to_scrape,
+            concurrency=SCRAPE_WORKERS,
+            limiter=_scrape_limiter,
+            stop_event=_stop_event,
+        )
+        
+        # Pets scraped from this page, saved together with one CSV append
+        page_pets = []
         new_pets_count = 0
         
-        # Scrape each link
-        for i, link in enumerate(links, 1):
-            try:
-                # Skip if already exists (check before scraping to save time)
-                if link in existing_links:
-                    log(f"Skipping duplicate link: {link}")
-                    continue
-                
-                log(f"Scraping {pet_type} {i}/{len(links)}: {link}")
-                scrape_pet(link, pet_type=pet_type)
-                existing_links.add(link)  # Add to set to avoid duplicates in same batch
-                new_pets_count += 1
-                server_status["total_pets_scraped"] += 1
-                
-                # Small delay to avoid overwhelming the server
-                time.sleep(1)
-                
-            except Exception as e:
-                log(f"Error scraping pet {link}: {e}")
+        for data in scraped:
+            if data is None:
                 continue
+            data["pet_type"] = pet_type
+            
+            # Validate pet data before saving
+            should_skip, reason = should_skip_pet(data)
+            if should_skip:
+                log(f"Skipping pet {data['link']}: {reason}")
+            else:
+                page_pets.append(data)
+            new_pets_count += 1
+            server_status["total_pets_scraped"] += 1
+        
+        # Save the page's pets, then remember them so later pages skip them
+        if page_pets:
+            # Only links whose rows reached the file; a buffered update that is
+            # lost in a crash must not leave its link marked as saved
+            written = save_pets_to_csv(page_pets, known_links=get_existing_links())
+            record_links(written)
         
         log(f"Page {page} for {pet_type}s: {new_pets_count} new pets scraped")
         return new_pets_count
@@ -223,13 +524,134 @@ def scrape_pets_from_page(page: int, pet_type: str) -> int:
         return 0
 
 
+def _load_verified_links() -> LinkSet:
+    """Load the links already checked by an interrupted verification pass (as fingerprints)."""
+    results = LinkSet()
+    if os.path.exists(VERIFIED_LOG_FILE):
+        try:
+            with open(VERIFIED_LOG_FILE, "rb") as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                    except ValueError:
+                        # Partial last line from a crash
+                        continue
+                    results.add(entry["link"])
+        except Exception as e:
+            log(f"Error reading verification log: {e}")
+    return results
+
+
+def _load_removed_links() -> set:
+    """Load the links tombstoned by verification."""
+    if not os.path.exists(REMOVED_LINKS_FILE):
+        return set()
+    with open(REMOVED_LINKS_FILE, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def _iter_raw_records(f):
+    """
+    Yield each CSV record of a binary file as its raw bytes (line terminator included).
+    A quoted field may span lines, so lines are joined until the quotes balance.
+    """
+    record = b""
+    for line in f:
+        record += line
+        if record.count(b'"') % 2 == 0:
+            yield record
+            record = b""
+    if record:
+        yield record
+
+
+def _record_link(record: bytes, link_idx: int) -> str:
+    """Return the link field of a raw CSV record, parsing with csv only when needed."""
+    if link_idx == 0 and not record.startswith(b'"'):
+        return record.split(b",", 1)[0].strip().decode("utf-8")
+    row = next(csv.reader([record.decode("utf-8")]), [])
+    return row[link_idx].strip() if len(row) > link_idx else ""
+
+
+def _iter_csv_links():
+    """
+    Yield the link of every row in pets.csv.
+    Works on raw bytes: an unquoted leading link is cut out with bytes.split,
+    and the csv module is only used for records that need it.
+    """
+    with open(PET_CSV, "rb", buffering=CSV_BUFFER_SIZE) as f:
+        header_line = f.readline()
+        if not header_line.strip():
+            return
+        header = next(csv.reader([header_line.decode("utf-8")]))
+        if "link" not in header:
+            return
+        link_idx = header.index("link")
+        for record in _iter_raw_records(f):
+            link = _record_link(record, link_idx)
+            if link:
+                yield link
+
+
+def compact_csv() -> int:
+    """
+    Drop tombstoned rows from pets.csv in one streaming pass (atomic replace),
+    then clear the tombstones and rebuild the links index.
+    
+    Returns:
+        Number of rows removed
+    """
+    removed = _load_removed_links()
+    if not removed:
+        return 0
+    
+    tmp = PET_CSV + ".tmp"
+    counts = {"kept": 0, "dropped": 0}
+    with open(PET_CSV, "rb", buffering=CSV_BUFFER_SIZE) as src, \
+            open(tmp, "wb", buffering=CSV_BUFFER_SIZE) as dst:
+        header_line = src.readline()
+        if not header_line.strip():
+            return 0
+        header = next(csv.reader([header_line.decode("utf-8")]))
+        link_idx = header.index("link")
+        dst.write(header_line)
+        
+        def kept_links():
+            # Single pass: kept records are copied byte-for-byte to the new CSV
+            # (no csv re-quoting) as their link is written to the new links index
+            for record in _iter_raw_records(src):
+                link = _record_link(record, link_idx)
+                if not link:
+                    continue
+                if link in removed:
+                    counts["dropped"] += 1
+                    continue
+                dst.write(record if record.endswith(b"\n") else record + b"\r\n")
+                counts["kept"] += 1
+                yield link
+        
+        # The index is replaced first; if we crash before the CSV replace it only
+        # lacks links still in removed.set, which the next pass compacts again
+        rebuild_links_index(kept_links())
+    
+    # Atomic replace
+    os.replace(tmp, PET_CSV)
+    os.remove(REMOVED_LINKS_FILE)
+    log(f"Compacted CSV: {counts['dropped']} pets removed, {counts['kept']} pets remain")
+    return counts["dropped"]
+
+
 def verify_all_pets(resume_from_link: str = None) -> int:
     """
     Verify all pets in pets.csv and remove invalid ones.
-    Can resume from a specific link if verification was interrupted.
+    Links are checked concurrently in batches; each finished batch is appended
+    to verified.log so an interrupted pass can resume without re-checking them.
+    Invalid links are tombstoned in removed.set and the CSV is only rewritten
+    once, at the end of the pass, if anything was removed.
     
     Args:
-        resume_from_link: Link to resume verification from (None to start from beginning)
+        resume_from_link: Last link saved as verification progress; if set,
+            results from the interrupted pass are reused (None to start fresh)
     
     Returns:
         Number of pets removed
@@ -238,6 +660,9 @@ def verify_all_pets(resume_from_link: str = None) -> int:
     if resume_from_link:
         log(f"Resuming verification from link: {resume_from_link}")
     
+    # Write any buffered pet updates so they are verified (and not lost by the rewrite)
+    flush_pet_csv(PET_CSV)
+    
     if not os.path.exists(PET_CSV):
         log("No CSV file found, skipping verification")
         return 0
@@ -251,65 +676,76 @@ def verify_all_pets(resume_from_link: str = None) -> int:
         except Exception as e:
             log(f"Warning: Could not remove temp file: {e}")
     
-    # Read all rows
-    all_rows = []
-    removed_count = 0
-    start_verifying = resume_from_link is None
+    # Links already checked in this pass (only when resuming)
+    if resume_from_link:
+        done = _load_verified_links()
+        log(f"Loaded {len(done)} verified links from previous run")
+    else:
+        done = LinkSet()
+        # A fresh pass starts clean: tombstones left by an aborted pass would
+        # otherwise be compacted away even if this pass finds the links valid
+        for stale in (VERIFIED_LOG_FILE, REMOVED_LINKS_FILE):
+            if os.path.exists(stale):
+                os.remove(stale)
+    
+    limiter = RateLimiter(VERIFY_RATE)
+    
+    def verify_rate_limited(link: str) -> Optional[bool]:
+        limiter.acquire()
+        return verify_link(link)
     
     try:
-        # First pass: read all rows and find resume point
-        with open(PET_CSV, "r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            for row in reader:
-                link = row.get("link", "").strip()
-                if not link:
-                    continue
-                
-                # If resuming, skip until we find the resume point
-                if not start_verifying:
-                    if link == resume_from_link:
-                        start_verifying = True
-                        # Include this link in verification (it was saved as progress but may not have been verified)
-                    else:
-                        # Keep rows before resume point (assuming they were verified before crash)
-                        all_rows.append(row)
+        with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as executor, \
+                open(VERIFIED_LOG_FILE, "ab") as verified_log, \
+                open(REMOVED_LINKS_FILE, "a", encoding="utf-8") as removed_log:
+            
+            def run_batch(batch: list) -> None:
+                futures = {executor.submit(verify_rate_limited, link): link for link in batch}
+                for future in as_completed(futures):
+                    link = futures[future]
+                    valid = future.result()
+                    if valid is None:
+                        # Fetch failed: state unknown, so keep the pet (and leave it
+                        # out of verified.log so a resumed pass checks it again)
+                        log(f"Could not verify link, keeping it: {link}")
                         continue
+                    verified_log.write(orjson.dumps({"link": link, "valid": valid}) + b"\n")
+                    if valid:
+                        server_status["total_pets_verified"] += 1
+                    else:
+                        log(f"Removing invalid link: {link}")
+                        removed_log.write(link + "\n")
+                        forget_link(link)
+                        server_status["total_pets_removed"] += 1
                 
-                # Verify the link
-                log(f"Verifying link: {link}")
-                
-                # Save progress BEFORE verification (so we can resume even if verification fails)
-                save_progress(mode="verification", verification_link=link)
-                
-                if verify_link(link):
-                    # Keep valid link
-                    all_rows.append(row)
-                    server_status["total_pets_verified"] += 1
-                else:
-                    # Remove invalid link
-                    log(f"Removing invalid link: {link}")
-                    removed_count += 1
-                    server_status["total_pets_removed"] += 1
-                
-                # Small delay
-                time.sleep(0.5)
-        
-        # Write back valid rows
-        if fieldnames:
-            tmp = PET_CSV + ".tmp"
-            with open(tmp, "w", encoding="utf-8", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(all_rows)
+                # Batch is recorded; progress points at its last link
+                removed_log.flush()
+                verified_log.flush()
+                save_progress(mode="verification", verification_link=batch[-1])
             
-            # Atomic replace
-            os.replace(tmp, PET_CSV)
-            log(f"Verification complete: {removed_count} pets removed, {len(all_rows)} pets remain")
+            # Stream links from the CSV, dispatching one batch at a time
+            batch = []
+            for link in _iter_csv_links():
+                if link in done:
+                    continue
+                done.add(link)
+                batch.append(link)
+                if len(batch) >= VERIFY_BATCH_SIZE:
+                    run_batch(batch)
+                    batch = []
+            if batch:
+                run_batch(batch)
+        
+        # Drop tombstoned rows (no rewrite when nothing was removed)
+        removed_count = compact_csv()
+        log(f"Verification complete: {removed_count} pets removed")
+        
+        # Pass finished; the next one starts fresh
+        os.remove(VERIFIED_LOG_FILE)
         
     except Exception as e:
         log(f"Error during verification: {e}")
-        # Progress is already saved, so we can resume from the last saved link
+        # Verified batches are logged, so we can resume from where we left off
         raise  # Re-raise to allow scraping_loop to handle it
     
     return removed_count
@@ -318,6 +754,7 @@ def verify_all_pets(resume_from_link: str = None) -> int:
 def scraping_loop():
     """Main scraping loop that runs continuously."""
     log("Starting scraping loop...")
+    _stop_event.clear()
     server_status["running"] = True
     
     # Load progress from disk (resume from where we left off)
@@ -344,6 +781,10 @@ def scraping_loop():
     if mode == "scraping":
         log(f"Resuming scraping from page {start_page}, pet_type: {start_pet_type}")
     
+    # Load the duplicate-check set once up front (streamed from links.idx or
+    # pets.csv); pages then only read lines appended since the last check
+    log(f"Loaded {len(get_existing_links())} existing links")
+    
     while server_status["running"]:
         try:
             # Scrape pages from start_page to 10000 for dogs and cats
@@ -375,7 +816,8 @@ def scraping_loop():
                     scrape_pets_from_page(page, pet_type)
                     
                     # Save progress after each page/pet_type combination
-                    save_progress(page=page, pet_type=pet_type, mode="scraping")
+                    # (written to disk at least every 10 pages regardless of the interval)
+                    save_progress(page=page, pet_type=pet_type, mode="scraping", force=page % 10 == 0)
                 
                 # Reset start_page after first iteration to ensure normal flow
                 if page == start_page:
@@ -401,7 +843,54 @@ def scraping_loop():
         except Exception as e:
             log(f"Error in scraping loop: {e}")
             # Progress is already saved, so we can resume from where we left off
-            time.sleep(60)  # Wait before retrying
+            _stop_event.wait(60)  # Wait before retrying (returns early on /stop)
+
+
+def acquire_scraper_lock() -> bool:
+    """
+    Claim the scraper role for this process.
+    
+    Returns:
+        True if this process holds (or just took) the scraper lock, False if
+        another process already runs the scraping loop
+    """
+    global _scraper_lock_fd, _scraper_lock_pid
+    if _scraper_lock_fd is not None and _scraper_lock_pid == os.getpid():
+        return True
+    
+    try:
+        import fcntl
+    except ImportError:
+        # No flock on Windows; development runs a single process anyway
+        return True
+    
+    fd = os.open(SCRAPER_LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    # Kept open for the life of the process; the lock is released when it exits
+    _scraper_lock_fd = fd
+    _scraper_lock_pid = os.getpid()
+    return True
+
+
+def start_scraping_thread() -> bool:
+    """
+    Start the scraping loop unless this process already has one running.
+    
+    Returns:
+        True if a new loop was started
+    """
+    global scraping_thread
+    with _start_lock:
+        # A stopped loop may still be finishing its page; don't run two
+        if scraping_thread is not None and scraping_thread.is_alive():
+            return False
+        scraping_thread = Thread(target=scraping_loop, daemon=True)
+        scraping_thread.start()
+        return True
 
 
 @app.route("/")
@@ -434,8 +923,12 @@ def start():
     if server_status["running"]:
         return jsonify({"message": "Scraping already running"}), 400
     
-    thread = Thread(target=scraping_loop, daemon=True)
-    thread.start()
+    if not acquire_scraper_lock():
+        return jsonify({"message": "Scraping runs in another worker process"}), 409
+    
+    if not start_scraping_thread():
+        # Either just started by another request or still finishing after /stop
+        return jsonify({"message": "Scraping loop already running"}), 409
     return jsonify({"message": "Scraping started"})
 
 
@@ -443,6 +936,7 @@ def start():
 def stop():
     """Stop the scraping loop."""
     server_status["running"] = False
+    _stop_event.set()
     return jsonify({"message": "Scraping stopped"})
 
 
@@ -454,8 +948,9 @@ def verify_endpoint_key() -> bool:
         return False
     
     try:
+        # load_scraping_key is cached until endpointkey.txt changes; compare in constant time
         expected_key = load_scraping_key()
-        return provided_key == expected_key
+        return hmac.compare_digest(provided_key.encode("utf-8"), expected_key.encode("utf-8"))
     except Exception:
         return False
 
@@ -474,20 +969,37 @@ def get_pets():
         return jsonify({"error": "No pets data available", "pets": []}), 200
     
     try:
-        # Read CSV and return as JSON
-        pets = []
-        with open(PET_CSV, "r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                pets.append(dict(row))
-        
-        return jsonify({
-            "count": len(pets),
-            "pets": pets
-        })
+        # Open before streaming so a read failure can still return a 500
+        f = open(PET_CSV, "r", encoding="utf-8", newline="", buffering=CSV_BUFFER_SIZE)
     except Exception as e:
         log(f"Error reading pets CSV: {e}")
         return jsonify({"error": "Failed to read pets data"}), 500
+    
+    def generate():
+        # Stream pets in batches instead of building the whole list in memory;
+        # each batch is one orjson call and one chunk on the wire.
+        # "count" comes last since it is only known once every row has been sent
+        with f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            yield b'{"pets":['
+            count = 0
+            batch = []
+            for row in reader:
+                if not row:
+                    continue
+                batch.append(dict(zip(header, row)))
+                if len(batch) >= PETS_STREAM_BATCH:
+                    # Serialized list without its brackets
+                    yield (b"," if count else b"") + orjson.dumps(batch)[1:-1]
+                    count += len(batch)
+                    batch = []
+            if batch:
+                yield (b"," if count else b"") + orjson.dumps(batch)[1:-1]
+                count += len(batch)
+            yield b'],"count":%d}' % count
+    
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 @app.route("/pets.csv", methods=["GET"])
@@ -504,24 +1016,38 @@ def get_pets_csv():
         return Response("", mimetype="text/csv"), 200
     
     try:
-        # Read and return CSV file directly
-        with open(PET_CSV, "r", encoding="utf-8") as f:
-            csv_content = f.read()
-        
-        return Response(
-            csv_content,
+        # Let the WSGI server stream the file (sendfile where available);
+        # conditional=True adds Range / If-Modified-Since handling
+        return send_file(
+            os.path.abspath(PET_CSV),  # relative paths resolve against the app root
             mimetype="text/csv",
-            headers={"Content-Disposition": "attachment; filename=pets.csv"}
+            as_attachment=True,
+            download_name="pets.csv",
+            conditional=True,
         )
     except Exception as e:
         log(f"Error reading pets CSV: {e}")
         return jsonify({"error": "Failed to read pets data"}), 500
 
 
-# Start scraping loop in background thread when module is imported
-# This ensures it starts with gunicorn as well
-scraping_thread = Thread(target=scraping_loop, daemon=True)
-scraping_thread.start()
+def start_background_scraping() -> None:
+    """
+    Start the scraping loop in this process if it can take the scraper lock.
+    With several workers only the one holding the lock scrapes; the others
+    just serve the API.
+    """
+    if acquire_scraper_lock():
+        start_scraping_thread()
+    else:
+        log("Scraping loop already running in another process; serving API only")
+
+
+# Start scraping loop in background thread when module is imported.
+# gunicorn.conf.py sets SCRAPER_AUTOSTART=0 and calls start_background_scraping()
+# from post_fork instead: with --preload the module is imported in the master,
+# and a loop started there would not be the one /start, /stop and /status see
+if os.environ.get("SCRAPER_AUTOSTART", "1") != "0":
+    start_background_scraping()
 
 if __name__ == "__main__":
     # Start Flask server (for local development)
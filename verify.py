@@ -3,44 +3,301 @@ Link verification function to check if a Petfinder pet link is valid.
 Uses pet_scraper to scrape the link and checks if enough data was retrieved.
 """
 
-from pet_scraper import scrape_pet_data_only
+import argparse
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def verify_link(link: str) -> bool:
+from pet_scraper import (
+    scrape_pet_data_only,
+    SCRAPING_SERVER_URL,
+    FIELDS,
+    HTTP_POOL_SIZE,
+    VERIFY_FAIL_THRESHOLD,
+    ScrapingAuthError,
+    ScrapingServerError,
+)
+from rate_limiter import RateLimiter
+
+# Per-link outcomes are logged at DEBUG (enable with logging.basicConfig(level=logging.DEBUG));
+# lazy %-formatting so nothing is formatted when the level is off
+logger = logging.getLogger(__name__)
+
+# Verification results are cached per link (LRU, in memory) for this long.
+# Invalid results expire sooner: a page that failed to render is rechecked
+# after a short while instead of being pinned as invalid for a day
+VERIFY_CACHE_TTL = 24 * 60 * 60
+VERIFY_NEGATIVE_CACHE_TTL = 15 * 60
+VERIFY_CACHE_SIZE = 10000
+
+# link -> (verified_at, is_valid); oldest use first
+_verify_cache: "OrderedDict[str, Tuple[float, bool]]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+# Shape of a (normalized) pet detail page URL:
+# https://www.petfinder.com/{type}/{name-id}/{state}/{city}/{organization}/details/
+# Anything else is rejected without a network call (and never sent to other hosts)
+_PET_URL_RE = re.compile(r"https://www\.petfinder\.com/[a-z-]+/[^/]+/[^/]+/[^/]+/[^/]+/details/")
+
+# Statuses from a direct HEAD request that prove a pet page is gone, so the
+# scraping server round trip and HTML parse can be skipped. Anything else
+# (including bot-protection 403s and network errors) falls through to the full check.
+DEAD_LINK_STATUSES = {404, 410}
+HEAD_TIMEOUT = 5
+
+# Pooled keep-alive session for every verification request (HEAD pre-checks to
+# petfinder.com and page fetches through the scraping server), so back-to-back
+# checks reuse connections. Transient gateway errors and 429s are retried with
+# exponential backoff (honouring Retry-After). Read timeouts are not: a timed-out
+# page already counts as unknown, and retries would bypass the host pacing
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(total=3, read=0, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+))
+
+# Requests to each host (HEAD pre-checks to petfinder.com, page fetches to the
+# scraping server) are paced to this many per second across all threads, so
+# concurrent verification (verify_links, the CLI) stays under the rate limits
+# instead of collecting 429s
+HOST_RATE = float(os.environ.get("VERIFY_HOST_RATE", 8))
+HOST_BURST = 8
+
+
+_host_limiter = RateLimiter(HOST_RATE, burst=HOST_BURST)
+
+
+def _pace(url: str) -> None:
+    """Wait for a request slot to the URL's host."""
+    _host_limiter.acquire(urlsplit(url).netloc.lower())
+
+
+def normalize_link(link: str) -> str:
+    """Normalize a pet URL so cosmetic variants share a cache entry (no query/fragment, lowercase host, trailing slash)."""
+    parts = urlsplit(link.strip())
+    path = parts.path if parts.path.endswith("/") else parts.path + "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, "", ""))
+
+
+def _get_cached_result(key: str) -> Optional[bool]:
+    """Return the cached result for a normalized link, or None if missing/expired."""
+    with _verify_cache_lock:
+        entry = _verify_cache.get(key)
+        if entry is None:
+            return None
+        verified_at, is_valid = entry
+        ttl = VERIFY_CACHE_TTL if is_valid else VERIFY_NEGATIVE_CACHE_TTL
+        if time.monotonic() - verified_at > ttl:
+            del _verify_cache[key]
+            return None
+        _verify_cache.move_to_end(key)
+        return is_valid
+
+
+def _cache_result(key: str, is_valid: bool) -> None:
+    """Store a verification result, evicting the least recently used entries."""
+    with _verify_cache_lock:
+        _verify_cache[key] = (time.monotonic(), is_valid)
+        _verify_cache.move_to_end(key)
+        while len(_verify_cache) > VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+
+
+def clear_verify_cache() -> None:
+    """Forget all cached verification results."""
+    with _verify_cache_lock:
+        _verify_cache.clear()
+
+
+def is_dead_link(link: str) -> bool:
+    """
+    Cheap pre-check: HEAD the pet page directly and report whether it is definitely gone.
+    
+    Args:
+        link: The pet URL to check
+        
+    Returns:
+        True only if the page answered with a DEAD_LINK_STATUSES status
+    """
+    _pace(link)
+    try:
+        response = _SESSION.head(link, allow_redirects=True, timeout=HEAD_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code in DEAD_LINK_STATUSES
+
+
+def verify_link(link: str) -> Optional[bool]:
     """
     Verify if a Petfinder pet link is valid.
     Uses pet_scraper to scrape the link and checks if enough data was retrieved.
+    Results are cached for VERIFY_CACHE_TTL seconds (VERIFY_NEGATIVE_CACHE_TTL
+    if invalid); fetch errors are not cached.
     
     Args:
         link: The pet URL to verify
         
     Returns:
-        True if link is valid (<3 fields failed to be read), False if invalid (>=3 fields failed)
+        True if link is valid (<VERIFY_FAIL_THRESHOLD fields failed to be read), False if invalid,
+        None if the page could not be fetched (network error, scraping server error
+        or rate limit that outlasted the retries) - the link's state is unknown
+        
+    Raises:
+        ScrapingAuthError, OSError, ValueError: Configuration problems (rejected
+            or missing scraping key) are raised rather than reported as invalid links
     """
+    key = normalize_link(link)
+    if not _PET_URL_RE.fullmatch(key):
+        logger.debug("Link invalid: not a Petfinder pet page URL (%s)", link)
+        return False
+    
+    cached = _get_cached_result(key)
+    if cached is not None:
+        return cached
+    
+    if is_dead_link(link):
+        logger.debug("Link invalid: page no longer exists (%s)", link)
+        _cache_result(key, False)
+        return False
+    
     try:
-        # Scrape the pet data using pet_scraper (without saving to CSV)
+        # Scrape the pet data using pet_scraper (without saving to CSV);
+        # verify_mode stops reading fields once the threshold is reached
         # Returns (data, failed_count)
-        data, fields_failed = scrape_pet_data_only(link)
+        _pace(SCRAPING_SERVER_URL)
+        data, fields_failed = scrape_pet_data_only(link, verify_mode=True, session=_SESSION)
         
-        total_fields = 15  # Total expected fields
+        total_fields = len(FIELDS)
         
         # Return False if 3 or more fields failed to be read
-        if fields_failed >= 3:
-            print(f"Link invalid: {fields_failed} fields failed to be read (out of {total_fields})")
+        if fields_failed >= VERIFY_FAIL_THRESHOLD:
+            logger.debug("Link invalid: %s fields failed to be read (out of %s)", fields_failed, total_fields)
+            _cache_result(key, False)
             return False
         
-        print(f"Link valid: Only {fields_failed} fields failed to be read (out of {total_fields})")
+        logger.debug("Link valid: Only %s fields failed to be read (out of %s)", fields_failed, total_fields)
+        _cache_result(key, True)
         return True
                 
-    except Exception as e:
-        print(f"Error verifying link {link}: {e}")
-        return False
+    except ScrapingAuthError:
+        raise
+    except (requests.exceptions.RequestException, ScrapingServerError) as e:
+        # Unknown, not invalid (and not cached): a fetch error says nothing about the link itself
+        logger.warning("Error verifying link %s: %s", link, e)
+        return None
+
+
+def verify_links(links: Iterable[str], concurrency: int = 8) -> List[Optional[bool]]:
+    """
+    Verify several Petfinder pet links concurrently.
+    Each check is dominated by the scraping server round trip, so a thread pool
+    overlaps those waits (requests releases the GIL while blocked on the socket).
+    
+    For a column of links (e.g. a pandas Series) prefer one call here over
+    series.apply(verify_link), which checks the links one at a time:
+    pd.Series(verify_links(series), index=series.index)
+    
+    Args:
+        links: The pet URLs to verify (any iterable: list, generator, Series)
+        concurrency: Maximum number of links checked at once (capped at the
+            HTTP connection pool size so every worker reuses a connection)
+        
+    Returns:
+        List aligned with links: True if valid, False if invalid, None if unknown (fetch error)
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, HTTP_POOL_SIZE))) as executor:
+        return list(executor.map(verify_link, links))
+
+
+def verify_links_file(links_path: str, valid_path: str, invalid_path: str, concurrency: int = 8) -> Tuple[int, int, int]:
+    """
+    Verify every link in a text file (one per line), writing each one to the
+    valid or invalid output file as soon as its check finishes. Links that
+    could not be fetched go to neither file (they are counted as unknown).
+    Links are read lazily and at most a few batches are in flight, so memory
+    does not grow with the size of the file.
+    
+    Args:
+        links_path: File of pet URLs, one per line (blank lines are skipped)
+        valid_path: File the valid links are appended to
+        invalid_path: File the invalid links are appended to
+        concurrency: Maximum number of links checked at once
+        
+    Returns:
+        Tuple of (valid count, invalid count, unknown count)
+    """
+    workers = max(1, min(concurrency, HTTP_POOL_SIZE))
+    max_pending = workers * 4
+    valid_count = invalid_count = unknown_count = 0
+    
+    with open(links_path, "r", encoding="utf-8") as links_file, \
+            open(valid_path, "a", encoding="utf-8") as valid_out, \
+            open(invalid_path, "a", encoding="utf-8") as invalid_out, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        
+        pending: Dict[Future, str] = {}
+        
+        def drain(return_when: str) -> None:
+            nonlocal valid_count, invalid_count, unknown_count
+            done, _ = wait(pending, return_when=return_when)
+            for future in done:
+                link = pending.pop(future)
+                is_valid = future.result()
+                if is_valid is None:
+                    unknown_count += 1
+                elif is_valid:
+                    valid_out.write(link + "\n")
+                    valid_count += 1
+                else:
+                    invalid_out.write(link + "\n")
+                    invalid_count += 1
+        
+        for line in links_file:
+            link = line.strip()
+            if not link:
+                continue
+            pending[executor.submit(verify_link, link)] = link
+            if len(pending) >= max_pending:
+                drain(FIRST_COMPLETED)
+        if pending:
+            drain(ALL_COMPLETED)
+    
+    return valid_count, invalid_count, unknown_count
 
 
 if __name__ == "__main__":
-    # Test with a sample link
-    test_link = "https://www.petfinder.com/dog/brahndi-2b34ab68-c16c-364a-a958-cc72d149da94/ny/new-york/shelter-chic-ny1286/details/"
-    print(f"Verifying link: {test_link}")
-    is_valid = verify_link(test_link)
-    print(f"Link is valid: {is_valid}")
+    parser = argparse.ArgumentParser(description="Verify Petfinder pet links.")
+    parser.add_argument("links_file", nargs="?", help="File of pet URLs, one per line (default: check a sample link)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Links checked at once (default: 8)")
+    parser.add_argument("--valid-out", default="valid.txt", help="Output file for valid links (default: valid.txt)")
+    parser.add_argument("--invalid-out", default="invalid.txt", help="Output file for invalid links (default: invalid.txt)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log the outcome of every link")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+    
+    if args.links_file:
+        valid_count, invalid_count, unknown_count = verify_links_file(
+            args.links_file, args.valid_out, args.invalid_out, concurrency=args.concurrency
+        )
+        print(f"Verified {valid_count + invalid_count} links: {valid_count} valid, {invalid_count} invalid")
+        if unknown_count:
+            print(f"{unknown_count} links could not be fetched (written to neither file)")
+    else:
+        # Test with a sample link
+        test_link = "https://www.petfinder.com/dog/brahndi-2b34ab68-c16c-364a-a958-cc72d149da94/ny/new-york/shelter-chic-ny1286/details/"
+        print(f"Verifying link: {test_link}")
+        is_valid = verify_link(test_link)
+        print(f"Link is valid: {is_valid}")
 